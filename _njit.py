@@ -0,0 +1,17 @@
+"""
+Optional numba JIT decorator.
+
+Kernels are decorated with `njit` from here so they compile to native code
+when numba is installed and run as plain Python otherwise.
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; fall back to plain Python loops
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
@@ -1,15 +1,14 @@
 import streamlit as st
 import pandas as pd
-import yfinance as yf
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import numpy as np
 from datetime import datetime, timedelta
 from simple_strategy import SimpleStrategy
-from utils import calculate_rsi, format_percentage, validate_ticker
-from database import init_database, save_backtest_results, get_backtest_history, get_backtest_details, get_ticker_statistics
+from utils import downsample_indices, format_percentage, split_valid_tickers, validate_ticker
+from database import init_database, save_backtest_results, cached_backtest_history, get_backtest_details, get_ticker_statistics
 from strategy_playground import render_strategy_playground
 from notifications import render_notification_settings, check_live_signals, format_trading_signal
+from price_cache import get_prices
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 
 # Page configuration
@@ -19,9 +18,14 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize database
-try:
+# Initialize database once per server process rather than on every rerun
+@st.cache_resource(show_spinner=False)
+def _init_db_once():
     init_database()
+    return True
+
+try:
+    _init_db_once()
 except Exception as e:
     st.error(f"Database initialization error: {str(e)}")
 
@@ -41,6 +45,220 @@ if 'exit_percentage' not in st.session_state:
 if 'red_days' not in st.session_state:
     st.session_state.red_days = 2
 
+# Yahoo accepts up to 20 symbols per request URL
+YF_BATCH_SIZE = 20
+YF_MAX_WORKERS = 8
+
+# Results table columns and their storage dtypes
+RESULT_DTYPES = {
+    'Ticker': object,
+    'Trades': np.int32,
+    'Avg Return (%)': np.float32,
+    'Win Rate (%)': np.float32,
+    'Total Return (%)': np.float32,
+    'Best Trade (%)': np.float32,
+    'Worst Trade (%)': np.float32
+}
+
+# Cap on RSI line points sent to the browser; LTTB picks them from the RSI series itself
+MAX_CHART_BARS = 2000
+
+# Display formats for the per-ticker trade details table
+TRADE_DETAILS_FORMAT = {
+    'Buy Price': '${:.2f}',
+    'Sell Price': '${:.2f}',
+    'Return (%)': '{:.2f}%'
+}
+
+# Longer daily ranges are drawn as weekly candles
+MAX_DAILY_CANDLES = 500
+WEEKLY_OHLC = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last'}
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_download(tickers, start, end):
+    """Download a batch of tickers, cached in memory for an hour on top of the disk cache"""
+    return get_prices(list(tickers), start, end)
+
+def download_price_data(tickers, start_date, end_date):
+    """Download price history for all tickers using batched, concurrent requests"""
+    symbols = list(dict.fromkeys(tickers))
+    chunks = [tuple(symbols[i:i + YF_BATCH_SIZE]) for i in range(0, len(symbols), YF_BATCH_SIZE)]
+    frames = {}
+
+    # yfinance treats `end` as exclusive, so ask for one extra day to include the end date.
+    # ISO strings keep the cache keys stable across reruns.
+    start_iso = start_date.isoformat()
+    end_iso = (end_date + timedelta(days=1)).isoformat()
+
+    def fetch(chunk):
+        return _cached_download(chunk, start_iso, end_iso)
+
+    with ThreadPoolExecutor(max_workers=min(len(chunks), YF_MAX_WORKERS)) as executor:
+        futures = {executor.submit(fetch, chunk): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            try:
+                frames.update(future.result())
+            except Exception as e:
+                st.warning(f"⚠️ Error downloading {', '.join(futures[future])}: {str(e)}")
+
+    # Trim to the requested range and drop tickers with nothing left
+    frames = {ticker: data.loc[str(start_date):str(end_date)] for ticker, data in frames.items()}
+    return {ticker: data for ticker, data in frames.items() if not data.empty}
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def build_trade_chart(ticker, data, trades_df, rsi_values, rsi_threshold):
+    """Build the price/RSI chart for a ticker, cached on its data, trades and threshold"""
+    # Plotly is only needed once there are results to chart
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    # Create plotly chart
+    fig = make_subplots(
+        rows=2, cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.1,
+        subplot_titles=[f'{ticker} Price with Signals', 'RSI'],
+        row_heights=[0.7, 0.3]
+    )
+
+    # Long ranges become weekly candles so highs and lows survive; Volume is not plotted
+    candles = data[list(WEEKLY_OHLC)]
+    if len(candles) > MAX_DAILY_CANDLES:
+        candles = candles.resample('W').agg(WEEKLY_OHLC).dropna()
+
+    # Downsample the RSI line with LTTB on its own values so threshold dips survive;
+    # the leading warm-up NaNs are never drawn, so drop them first
+    rsi_valid = rsi_values.dropna()
+    keep = downsample_indices(rsi_valid.index.asi8, rsi_valid.to_numpy(), MAX_CHART_BARS)
+    rsi_plot = rsi_valid.iloc[keep]
+
+    # Price chart
+    fig.add_trace(
+        go.Candlestick(
+            x=candles.index,
+            open=candles['Open'],
+            high=candles['High'],
+            low=candles['Low'],
+            close=candles['Close'],
+            name='Price'
+        ),
+        row=1, col=1
+    )
+
+    # Add buy signals
+    if not trades_df.empty:
+        fig.add_trace(
+            go.Scattergl(
+                x=trades_df['buy_date'].to_numpy(),
+                y=trades_df['buy_price'].to_numpy(),
+                mode='markers',
+                marker=dict(symbol='triangle-up', size=10, color='green'),
+                name='Buy Signal'
+            ),
+            row=1, col=1
+        )
+
+    # Add sell signals
+    closed = trades_df[trades_df['sell_date'].notna()] if not trades_df.empty else trades_df
+
+    if not closed.empty:
+        fig.add_trace(
+            go.Scattergl(
+                x=closed['sell_date'].to_numpy(),
+                y=closed['sell_price'].to_numpy(),
+                mode='markers',
+                marker=dict(symbol='triangle-down', size=10, color='red'),
+                name='Sell Signal'
+            ),
+            row=1, col=1
+        )
+
+    # RSI chart
+    fig.add_trace(
+        go.Scattergl(
+            x=rsi_plot.index,
+            y=rsi_plot,
+            name='RSI',
+            line=dict(color='purple')
+        ),
+        row=2, col=1
+    )
+
+    # Add RSI threshold line
+    fig.add_hline(
+        y=rsi_threshold,
+        line_dash="dash",
+        line_color="red",
+        annotation_text=f"RSI Threshold: {rsi_threshold}",
+        row=2, col=1
+    )
+
+    # Add RSI overbought/oversold lines
+    fig.add_hline(y=70, line_dash="dot", line_color="gray", row=2, col=1)
+    fig.add_hline(y=30, line_dash="dot", line_color="gray", row=2, col=1)
+
+    # Update layout
+    fig.update_layout(
+        height=600,
+        showlegend=True,
+        xaxis_rangeslider_visible=False
+    )
+
+    fig.update_yaxes(title_text="Price ($)", row=1, col=1)
+    fig.update_yaxes(title_text="RSI", row=2, col=1, range=[0, 100])
+
+    return fig
+
+@st.fragment
+def render_trade_charts(chart_data, rsi_threshold):
+    """Render per-ticker charts and trade details; widget changes here rerun only this fragment"""
+    st.header("📈 Trading Charts")
+
+    # Ticker selection for charts
+    available_tickers = list(chart_data.keys())
+    selected_tickers = st.multiselect(
+        "Select tickers to display charts:",
+        available_tickers,
+        default=available_tickers[:3] if len(available_tickers) >= 3 else available_tickers,
+        help="Select up to 5 tickers for chart display"
+    )
+
+    if selected_tickers:
+        # Limit to 5 charts for performance
+        if len(selected_tickers) > 5:
+            st.warning("⚠️ Displaying only the first 5 selected tickers for performance reasons.")
+            selected_tickers = selected_tickers[:5]
+
+        for ticker in selected_tickers:
+            st.subheader(f"{ticker} - Trading Signals")
+
+            chart_info = chart_data[ticker]
+            data = chart_info['data']
+            trades_df = chart_info['trades_df']
+
+            fig = build_trade_chart(ticker, data, trades_df, chart_info['rsi'], rsi_threshold)
+            st.plotly_chart(fig, use_container_width=True)
+
+            # Trade details for this ticker
+            if not trades_df.empty:
+                st.subheader(f"{ticker} - Trade Details")
+
+                # Keep values numeric and let a Styler format them for display
+                trade_details = pd.DataFrame({
+                    'Buy Date': pd.to_datetime(trades_df['buy_date']).dt.strftime('%Y-%m-%d').fillna('N/A'),
+                    'Buy Price': trades_df['buy_price'],
+                    'Sell Date': pd.to_datetime(trades_df['sell_date']).dt.strftime('%Y-%m-%d').fillna('Open'),
+                    'Sell Price': trades_df['sell_price'].replace(0, np.nan),
+                    'Return (%)': trades_df['return_pct'],
+                    'Days Held': trades_df['days_held']
+                })
+
+                st.dataframe(
+                    trade_details.style.format(TRADE_DETAILS_FORMAT, na_rep='N/A'),
+                    use_container_width=True,
+                    hide_index=True
+                )
+
 def render_live_signals_page():
     """Render the live signals monitoring page"""
     st.title("🚨 Live Trading Signals")
@@ -99,7 +317,8 @@ def render_live_signals_page():
                     signals = check_live_signals(
                         notification_settings['watchlist'], 
                         strategy_params, 
-                        notification_settings
+                        notification_settings,
+                        force_refresh=True
                     )
 
                 if signals:
@@ -146,8 +365,7 @@ def render_live_signals_page():
 
         # Show recent signals from database if available
         try:
-            from database import get_backtest_history
-            recent_runs = get_backtest_history(limit=5)
+            recent_runs = cached_backtest_history(st.session_state.get('last_backtest_id'), limit=5)
 
             if not recent_runs.empty:
                 st.subheader("Recent Backtests")
@@ -277,6 +495,11 @@ else:
             # Parse watchlist
             tickers = [ticker.strip().upper() for ticker in watchlist_input.split(",") if ticker.strip()]
 
+            # Format check only; unknown symbols are flagged when their download comes back empty
+            tickers, invalid_tickers = split_valid_tickers(tickers)
+            for ticker in invalid_tickers:
+                st.warning(f"⚠️ Invalid ticker symbol: {ticker}")
+
             if not tickers:
                 st.error("Please enter at least one ticker symbol!")
             else:
@@ -287,61 +510,51 @@ else:
                     red_days=red_days
                 )
 
-                # Progress bar
-                progress_bar = st.progress(0)
-                status_text = st.empty()
+                # Progress is reported in three phases: download, backtest, save
+                status = st.status(f"Downloading data for {len(tickers)} tickers...")
 
-                results = []
+                # Results are collected column-wise and typed once at the end
+                results = {column: [] for column in RESULT_DTYPES}
                 chart_data = {}
                 all_trades = {}
 
-                for i, ticker in enumerate(tickers):
-                    status_text.text(f"Processing {ticker}...")
-                    progress_bar.progress((i + 1) / len(tickers))
+                price_data = download_price_data(tickers, start_date, end_date)
+                status.update(label=f"Running backtests for {len(price_data)} tickers...")
 
+                for ticker in tickers:
                     try:
-                        # Skip validation for now to avoid pandas Series issues
-                        # if not validate_ticker(ticker):
-                        #     st.warning(f"⚠️ Invalid or delisted ticker: {ticker}")
-                        #     continue
-
-                        # Download data
-                        data = yf.download(ticker, start=start_date, end=end_date, progress=False)
+                        data = price_data.get(ticker)
 
                         if data is None or data.shape[0] == 0:
                             st.warning(f"⚠️ No data available for {ticker}")
                             continue
 
-                        # Fix multi-level column structure from yfinance
-                        if isinstance(data.columns, pd.MultiIndex):
-                            data.columns = data.columns.droplevel(1)  # Remove ticker level, keep price level
-
-                        # Run backtest
-                        trades, signals = strategy.backtest(data, ticker)
+                        # Run backtest; the RSI it used is reused for the chart
+                        trades, signals, rsi = strategy.backtest(data, ticker)
 
                         if trades:
-                            # Calculate metrics
-                            returns = [trade['return_pct'] for trade in trades]
-                            avg_return = np.mean(returns)
-                            win_rate = len([r for r in returns if r > 0]) / len(returns)
+                            # Columnar view of the trades, shared by metrics, charts and tables
+                            trades_df = pd.DataFrame(trades)
+
+                            # Calculate metrics from a single contiguous array of returns
+                            returns = trades_df['return_pct'].to_numpy(dtype=np.float64)
                             num_trades = len(trades)
-                            total_return = np.sum(returns)
-
-                            results.append({
-                                'Ticker': ticker,
-                                'Trades': num_trades,
-                                'Avg Return (%)': avg_return,
-                                'Win Rate (%)': win_rate * 100,
-                                'Total Return (%)': total_return,
-                                'Best Trade (%)': max(returns),
-                                'Worst Trade (%)': min(returns)
-                            })
+
+                            results['Ticker'].append(ticker)
+                            results['Trades'].append(num_trades)
+                            results['Avg Return (%)'].append(returns.mean())
+                            results['Win Rate (%)'].append((returns > 0).mean() * 100)
+                            results['Total Return (%)'].append(returns.sum())
+                            results['Best Trade (%)'].append(returns.max())
+                            results['Worst Trade (%)'].append(returns.min())
 
                             # Store chart data and trades
                             chart_data[ticker] = {
                                 'data': data,
                                 'trades': trades,
-                                'signals': signals
+                                'trades_df': trades_df,
+                                'signals': signals,
+                                'rsi': rsi
                             }
                             all_trades[ticker] = trades
 
@@ -349,18 +562,15 @@ else:
                         st.warning(f"⚠️ Error processing {ticker}: {str(e)}")
                         continue
 
-                # Clear progress indicators
-                progress_bar.empty()
-                status_text.empty()
-
-                if results:
+                if results['Ticker']:
                     # Store results in session state
-                    results_df = pd.DataFrame(results)
+                    results_df = pd.DataFrame(results).astype(RESULT_DTYPES)
                     st.session_state.results_data = results_df
                     st.session_state.chart_data = chart_data
                     st.session_state.all_trades = all_trades
 
                     # Save to database
+                    status.update(label="Saving results...")
                     try:
                         strategy_params = {
                             'rsi_threshold': rsi_threshold,
@@ -378,36 +588,38 @@ else:
                     except Exception as e:
                         st.warning(f"Results saved locally but database save failed: {str(e)}")
 
-                    st.success(f"✅ Strategy completed! Processed {len(results)} tickers successfully.")
+                    status.update(label=f"Processed {len(tickers)} tickers", state="complete")
+                    st.success(f"✅ Strategy completed! Processed {len(results_df)} tickers successfully.")
                 else:
+                    status.update(label=f"Processed {len(tickers)} tickers", state="error")
                     st.error("❌ No successful backtests. Please check your ticker symbols and date range.")
 
     # Display results if available
     if st.session_state.results_data is not None:
         st.header("📊 Backtest Results")
 
-        # Sort results
-        results_df = st.session_state.results_data.copy()
-
-        if sort_by == "Average Return":
-            results_df = results_df.sort_values("Avg Return (%)", ascending=False)
-        elif sort_by == "Win Rate":
-            results_df = results_df.sort_values("Win Rate (%)", ascending=False)
-        else:  # Number of Trades
-            results_df = results_df.sort_values("Trades", ascending=False)
-
-        # Format the dataframe for display
-        display_df = results_df.copy()
-        for col in ['Avg Return (%)', 'Win Rate (%)', 'Total Return (%)', 'Best Trade (%)', 'Worst Trade (%)']:
-            if col in display_df.columns:
-                if 'Win Rate' in col:
-                    display_df[col] = display_df[col].apply(lambda x: f"{x:.1f}%")
-                else:
-                    display_df[col] = display_df[col].apply(lambda x: f"{x:.2f}%")
+        # Sort results (sort_values returns a new frame, so session data is untouched)
+        sort_columns = {
+            "Average Return": "Avg Return (%)",
+            "Win Rate": "Win Rate (%)",
+            "Number of Trades": "Trades"
+        }
+        results_df = st.session_state.results_data.sort_values(
+            sort_columns[sort_by], ascending=False, ignore_index=True
+        )
+
+        # Format percentages at render time; the underlying columns stay numeric
+        results_format = {
+            'Avg Return (%)': '{:.2f}%',
+            'Win Rate (%)': '{:.1f}%',
+            'Total Return (%)': '{:.2f}%',
+            'Best Trade (%)': '{:.2f}%',
+            'Worst Trade (%)': '{:.2f}%'
+        }
 
         # Display results table
         st.dataframe(
-            display_df,
+            results_df.style.format(results_format),
             use_container_width=True,
             hide_index=True
         )
@@ -432,149 +644,14 @@ else:
             st.metric("Profitable Tickers", f"{profitable_tickers}/{len(results_df)}")
 
         # Chart section
-        st.header("📈 Trading Charts")
-
-        # Ticker selection for charts
-        available_tickers = list(st.session_state.chart_data.keys())
-        selected_tickers = st.multiselect(
-            "Select tickers to display charts:",
-            available_tickers,
-            default=available_tickers[:3] if len(available_tickers) >= 3 else available_tickers,
-            help="Select up to 5 tickers for chart display"
-        )
-
-        if selected_tickers:
-            # Limit to 5 charts for performance
-            if len(selected_tickers) > 5:
-                st.warning("⚠️ Displaying only the first 5 selected tickers for performance reasons.")
-                selected_tickers = selected_tickers[:5]
-
-            for ticker in selected_tickers:
-                st.subheader(f"{ticker} - Trading Signals")
-
-                chart_info = st.session_state.chart_data[ticker]
-                data = chart_info['data']
-                trades = chart_info['trades']
-
-                # Create plotly chart
-                fig = make_subplots(
-                    rows=2, cols=1,
-                    shared_xaxes=True,
-                    vertical_spacing=0.1,
-                    subplot_titles=[f'{ticker} Price with Signals', 'RSI'],
-                    row_heights=[0.7, 0.3]
-                )
-
-                # Price chart
-                fig.add_trace(
-                    go.Candlestick(
-                        x=data.index,
-                        open=data['Open'],
-                        high=data['High'],
-                        low=data['Low'],
-                        close=data['Close'],
-                        name='Price'
-                    ),
-                    row=1, col=1
-                )
-
-                # Add buy signals
-                buy_dates = [trade['buy_date'] for trade in trades]
-                buy_prices = [trade['buy_price'] for trade in trades]
-
-                if buy_dates:
-                    fig.add_trace(
-                        go.Scatter(
-                            x=buy_dates,
-                            y=buy_prices,
-                            mode='markers',
-                            marker=dict(symbol='triangle-up', size=10, color='green'),
-                            name='Buy Signal'
-                        ),
-                        row=1, col=1
-                    )
-
-                # Add sell signals
-                sell_dates = [trade['sell_date'] for trade in trades if trade['sell_date'] is not None]
-                sell_prices = [trade['sell_price'] for trade in trades if trade['sell_price'] is not None]
-
-                if sell_dates:
-                    fig.add_trace(
-                        go.Scatter(
-                            x=sell_dates,
-                            y=sell_prices,
-                            mode='markers',
-                            marker=dict(symbol='triangle-down', size=10, color='red'),
-                            name='Sell Signal'
-                        ),
-                        row=1, col=1
-                    )
-
-                # RSI chart
-                rsi_values = calculate_rsi(data['Close'])
-                fig.add_trace(
-                    go.Scatter(
-                        x=data.index,
-                        y=rsi_values,
-                        name='RSI',
-                        line=dict(color='purple')
-                    ),
-                    row=2, col=1
-                )
-
-                # Add RSI threshold line
-                fig.add_hline(
-                    y=rsi_threshold,
-                    line_dash="dash",
-                    line_color="red",
-                    annotation_text=f"RSI Threshold: {rsi_threshold}",
-                    row=2, col=1
-                )
-
-                # Add RSI overbought/oversold lines
-                fig.add_hline(y=70, line_dash="dot", line_color="gray", row=2, col=1)
-                fig.add_hline(y=30, line_dash="dot", line_color="gray", row=2, col=1)
-
-                # Update layout
-                fig.update_layout(
-                    height=600,
-                    showlegend=True,
-                    xaxis_rangeslider_visible=False
-                )
-
-                fig.update_yaxes(title_text="Price ($)", row=1, col=1)
-                fig.update_yaxes(title_text="RSI", row=2, col=1, range=[0, 100])
-
-                st.plotly_chart(fig, use_container_width=True)
-
-                # Trade details for this ticker
-                ticker_trades = trades
-                if ticker_trades:
-                    st.subheader(f"{ticker} - Trade Details")
-
-                    trade_details = []
-                    for trade in ticker_trades:
-                        trade_details.append({
-                            'Buy Date': trade['buy_date'].strftime('%Y-%m-%d') if trade['buy_date'] else 'N/A',
-                            'Buy Price': f"${trade['buy_price']:.2f}",
-                            'Sell Date': trade['sell_date'].strftime('%Y-%m-%d') if trade['sell_date'] else 'Open',
-                            'Sell Price': f"${trade['sell_price']:.2f}" if trade['sell_price'] else 'N/A',
-                            'Return (%)': f"{trade['return_pct']:.2f}%" if trade['return_pct'] is not None else 'N/A',
-                            'Days Held': trade['days_held'] if trade['days_held'] is not None else 'N/A'
-                        })
-
-                    st.dataframe(
-                        pd.DataFrame(trade_details),
-                        use_container_width=True,
-                        hide_index=True
-                    )
+        render_trade_charts(st.session_state.chart_data, rsi_threshold)
 
     # Database History Section
     st.markdown("---")
     st.header("📚 Backtest History")
 
     try:
-        history_df = get_backtest_history(limit=10)
+        history_df = cached_backtest_history(st.session_state.get('last_backtest_id'), limit=10)
         if not history_df.empty:
             st.subheader("Recent Backtests")
             st.dataframe(
@@ -597,156 +674,3 @@ else:
         rsi_threshold=rsi_threshold if 'rsi_threshold' in locals() else 30,
         exit_percentage=exit_percentage if 'exit_percentage' in locals() else 5.0
     ))
-
-def render_live_signals_page():
-    """Render the live signals monitoring page"""
-    st.title("🚨 Live Trading Signals")
-    st.markdown("""
-    Monitor your watchlist for real-time trading signals based on your strategy parameters.
-    Set up notifications to get alerts via SMS or email when signals are detected.
-    """)
-
-    # Get notification settings from sidebar
-    notification_settings = render_notification_settings()
-
-    # Strategy parameters for live monitoring
-    st.header("Strategy Parameters for Live Monitoring")
-    col1, col2, col3 = st.columns(3)
-
-    with col1:
-        live_rsi_threshold = st.slider("RSI Threshold", 10, 50, st.session_state.rsi_threshold)
-    with col2:
-        live_exit_percentage = st.slider("Exit %", 1.0, 10.0, st.session_state.exit_percentage, step=0.5)
-    with col3:
-        live_red_days = st.slider("Red Days", 1, 5, st.session_state.red_days)
-
-    strategy_params = {
-        'rsi_threshold': live_rsi_threshold,
-        'exit_percentage': live_exit_percentage / 100,
-        'red_days': live_red_days
-    }
-
-    # Manual signal check
-    if st.button("🔍 Check Signals Now", type="primary"):
-        if not notification_settings['watchlist']:
-            st.warning("Please add tickers to your watchlist in the sidebar")
-        else:
-            with st.spinner("Checking for trading signals..."):
-                signals = check_live_signals(
-                    notification_settings['watchlist'], 
-                    strategy_params, 
-                    notification_settings
-                )
-
-                if signals:
-                    st.success(f"Found {len(signals)} trading signal(s)!")
-
-                    for signal in signals:
-                        st.info(f"""
-                        **{signal['ticker']} - {signal['signal_type']} Signal**
-                        - Price: ${signal['price']:.2f}
-                        - RSI: {signal['rsi']:.1f}
-                        - Red Days: {signal['red_days']}
-                        - Time: {signal['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}
-                        """)
-                else:
-                    st.info("No trading signals found at this time")
-
-    # Current watchlist status
-    if notification_settings['watchlist']:
-        st.header("📊 Current Watchlist Status")
-
-        # Create a quick overview of current prices and RSI
-        overview_data = []
-        for ticker in notification_settings['watchlist']:
-            try:
-                # Get recent data
-                data = yf.download(ticker, period="30d", progress=False)
-                if isinstance(data.columns, pd.MultiIndex):
-                    data.columns = data.columns.droplevel(1)
-
-                if len(data) > 14:
-                    closes = data['Close'].values
-                    latest_price = closes[-1]
-
-                    from simple_strategy import calculate_simple_rsi
-                    rsi_values = calculate_simple_rsi(closes)
-                    latest_rsi = rsi_values[-1]
-
-                    # Calculate consecutive red days
-                    consecutive_red = 0
-                    for i in range(len(closes)-1, 0, -1):
-                        if closes[i] < closes[i-1]:
-                            consecutive_red += 1
-                        else:
-                            break
-
-                    # Check if signal conditions are met
-                    signal_active = (consecutive_red >= live_red_days and 
-                                   latest_rsi < live_rsi_threshold)
-
-                    overview_data.append({
-                        'Ticker': ticker,
-                        'Price': f"${latest_price:.2f}",
-                        'RSI': f"{latest_rsi:.1f}" if not pd.isna(latest_rsi) else "N/A",
-                        'Red Days': consecutive_red,
-                        'Signal': "🟢 BUY" if signal_active else "⚪ None"
-                    })
-            except:
-                overview_data.append({
-                    'Ticker': ticker,
-                    'Price': "Error",
-                    'RSI': "Error",
-                    'Red Days': "Error",
-                    'Signal': "Error"
-                })
-
-        if overview_data:
-            df_overview = pd.DataFrame(overview_data)
-            st.dataframe(df_overview, use_container_width=True)
-
-    # Instructions
-    st.header("📖 How to Set Up Notifications")
-
-    with st.expander("SMS Notifications Setup"):
-        st.markdown("""
-        To receive SMS notifications, you need Twilio credentials:
-        1. Sign up for a Twilio account at twilio.com
-        2. Get your Account SID, Auth Token, and Phone Number
-        3. The system administrator needs to add these to the environment variables
-        4. Enter your phone number in the sidebar (include country code, e.g., +1234567890)
-        """)
-
-    with st.expander("Email Notifications Setup"):
-        st.markdown("""
-        To receive email notifications using Gmail:
-        1. Use a Gmail account as the sender
-        2. Enable 2-factor authentication on the Gmail account
-        3. Generate an App Password (not your regular password)
-        4. Enter your email address and the sender's Gmail credentials in the sidebar
-
-        **Security Note:** Use a dedicated Gmail account for sending notifications.
-        """)
-
-    with st.expander("Strategy Parameters"):
-        st.markdown(f"""
-        Current monitoring parameters:
-        - **RSI Threshold:** {live_rsi_threshold} (Buy when RSI is below this value)
-        - **Red Days Required:** {live_red_days} (Number of consecutive down days)
-        - **Exit Percentage:** {live_exit_percentage}% (Target gain/loss for exit)
-
-        Signals are generated when a stock has {live_red_days} or more consecutive red days 
-        AND the RSI is below {live_rsi_threshold}.
-        """)
-
-    with st.expander("Troubleshooting"):
-        st.markdown("""
-        If you encounter issues, check the following:
-        - Ensure your Twilio/Gmail credentials are correct.
-        - Verify that you've enabled the necessary permissions (e.g., less secure app access for Gmail).
-        - Check your spam/junk folders for email notifications.
-        - Make sure your phone number is entered correctly for SMS notifications.
-        """)
-        st.markdown("""
-        If you still face issues after these steps, consider restarting your development environment, as this can help reset any stuck processes.
-        """)
\ No newline at end of file
@@ -1,6 +1,8 @@
 import os
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, Text
+import streamlit as st
+from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, Index, func, select
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
@@ -22,7 +24,7 @@ class BacktestRun(Base):
     __tablename__ = "backtest_runs"
     
     id = Column(Integer, primary_key=True, index=True)
-    run_date = Column(DateTime, default=datetime.utcnow)
+    run_date = Column(DateTime, default=datetime.utcnow, index=True)
     strategy_name = Column(String, default="Mean Reversion")
     
     # Strategy parameters
@@ -48,7 +50,7 @@ class TradeRecord(Base):
     __tablename__ = "trade_records"
     
     id = Column(Integer, primary_key=True, index=True)
-    backtest_run_id = Column(Integer)
+    backtest_run_id = Column(Integer, ForeignKey('backtest_runs.id'), index=True)
     
     # Trade details
     ticker = Column(String)
@@ -63,9 +65,13 @@ class TradeRecord(Base):
 class TickerPerformance(Base):
     """Store performance metrics per ticker per backtest"""
     __tablename__ = "ticker_performance"
+    __table_args__ = (
+        # Covers the ticker filter and run join in get_ticker_statistics, and any ticker-only lookup
+        Index('ix_ticker_performance_ticker_run', 'ticker', 'backtest_run_id'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    backtest_run_id = Column(Integer)
+    backtest_run_id = Column(Integer, ForeignKey('backtest_runs.id'), index=True)
     ticker = Column(String)
     
     # Performance metrics
@@ -113,9 +119,10 @@ def save_backtest_results(strategy_params, tickers, results_df, all_trades, char
             tickers=json.dumps(tickers),
             total_tickers=len(tickers),
             successful_tickers=len(results_df),
-            total_trades=results_df['Trades'].sum() if not results_df.empty else 0,
-            avg_win_rate=results_df['Win Rate (%)'].mean() if not results_df.empty else 0,
-            avg_return=results_df['Avg Return (%)'].mean() if not results_df.empty else 0,
+            total_trades=int(results_df['Trades'].sum()) if not results_df.empty else 0,
+            # Result columns are float32; psycopg2 can only bind native Python numbers
+            avg_win_rate=float(results_df['Win Rate (%)'].mean()) if not results_df.empty else 0,
+            avg_return=float(results_df['Avg Return (%)'].mean()) if not results_df.empty else 0,
             profitable_tickers=len(results_df[results_df['Avg Return (%)'] > 0]) if not results_df.empty else 0
         )
         
@@ -123,36 +130,39 @@ def save_backtest_results(strategy_params, tickers, results_df, all_trades, char
         db.commit()
         db.refresh(backtest_run)
         
-        # Save ticker performance records
-        for _, row in results_df.iterrows():
-            ticker_perf = TickerPerformance(
+        # Build all child rows up front and insert them in bulk
+        ticker_perfs = [
+            TickerPerformance(
                 backtest_run_id=backtest_run.id,
                 ticker=row['Ticker'],
-                num_trades=row['Trades'],
-                avg_return_pct=row['Avg Return (%)'],
-                win_rate_pct=row['Win Rate (%)'],
-                total_return_pct=row['Total Return (%)'],
-                best_trade_pct=row['Best Trade (%)'],
-                worst_trade_pct=row['Worst Trade (%)']
+                num_trades=int(row['Trades']),
+                avg_return_pct=float(row['Avg Return (%)']),
+                win_rate_pct=float(row['Win Rate (%)']),
+                total_return_pct=float(row['Total Return (%)']),
+                best_trade_pct=float(row['Best Trade (%)']),
+                worst_trade_pct=float(row['Worst Trade (%)'])
             )
-            db.add(ticker_perf)
+            for row in results_df.to_dict('records')
+        ]
         
-        # Save individual trade records
-        for ticker, trades in all_trades.items():
-            for trade in trades:
-                trade_record = TradeRecord(
-                    backtest_run_id=backtest_run.id,
-                    ticker=ticker,
-                    buy_date=trade['buy_date'],
-                    buy_price=trade['buy_price'],
-                    sell_date=trade['sell_date'],
-                    sell_price=trade['sell_price'],
-                    return_pct=trade['return_pct'],
-                    days_held=trade['days_held'],
-                    exit_reason=trade['exit_reason']
-                )
-                db.add(trade_record)
+        trade_records = [
+            TradeRecord(
+                backtest_run_id=backtest_run.id,
+                ticker=ticker,
+                buy_date=trade['buy_date'],
+                buy_price=trade['buy_price'],
+                sell_date=trade['sell_date'],
+                sell_price=trade['sell_price'],
+                return_pct=trade['return_pct'],
+                days_held=trade['days_held'],
+                exit_reason=trade['exit_reason']
+            )
+            for ticker, trades in all_trades.items()
+            for trade in trades
+        ]
         
+        db.bulk_save_objects(ticker_perfs)
+        db.bulk_save_objects(trade_records)
         db.commit()
         return backtest_run.id
     
@@ -162,6 +172,22 @@ def save_backtest_results(strategy_params, tickers, results_df, all_trades, char
     finally:
         db.close()
 
+# Column names shown in the backtest history table
+HISTORY_COLUMNS = {
+    'id': 'ID',
+    'run_date': 'Date',
+    'rsi_threshold': 'RSI Threshold',
+    'exit_percentage': 'Exit %',
+    'red_days': 'Red Days',
+    'period': 'Period',
+    'total_tickers': 'Tickers',
+    'successful_tickers': 'Successful',
+    'total_trades': 'Total Trades',
+    'avg_win_rate': 'Avg Win Rate (%)',
+    'avg_return': 'Avg Return (%)',
+    'profitable_tickers': 'Profitable Tickers'
+}
+
 def get_backtest_history(limit=10):
     """
     Retrieve recent backtest runs
@@ -172,32 +198,47 @@ def get_backtest_history(limit=10):
     Returns:
         pd.DataFrame: Historical backtest runs
     """
-    db = SessionLocal()
+    stmt = select(
+        BacktestRun.id,
+        BacktestRun.run_date,
+        BacktestRun.rsi_threshold,
+        BacktestRun.exit_percentage,
+        BacktestRun.red_days,
+        BacktestRun.start_date,
+        BacktestRun.end_date,
+        BacktestRun.total_tickers,
+        BacktestRun.successful_tickers,
+        BacktestRun.total_trades,
+        BacktestRun.avg_win_rate,
+        BacktestRun.avg_return,
+        BacktestRun.profitable_tickers
+    ).order_by(BacktestRun.run_date.desc()).limit(limit)
     
-    try:
-        runs = db.query(BacktestRun).order_by(BacktestRun.run_date.desc()).limit(limit).all()
-        
-        history_data = []
-        for run in runs:
-            history_data.append({
-                'ID': run.id,
-                'Date': run.run_date.strftime('%Y-%m-%d %H:%M'),
-                'RSI Threshold': run.rsi_threshold,
-                'Exit %': run.exit_percentage,
-                'Red Days': run.red_days,
-                'Period': f"{run.start_date.strftime('%Y-%m-%d')} to {run.end_date.strftime('%Y-%m-%d')}",
-                'Tickers': len(json.loads(run.tickers)),
-                'Successful': run.successful_tickers,
-                'Total Trades': run.total_trades,
-                'Avg Win Rate (%)': round(run.avg_win_rate, 1) if run.avg_win_rate else 0,
-                'Avg Return (%)': round(run.avg_return, 2) if run.avg_return else 0,
-                'Profitable Tickers': run.profitable_tickers
-            })
-        
-        return pd.DataFrame(history_data)
+    runs = pd.read_sql(stmt, engine, parse_dates=['run_date', 'start_date', 'end_date'])
     
-    finally:
-        db.close()
+    if runs.empty:
+        return pd.DataFrame()
+    
+    runs['run_date'] = runs['run_date'].dt.strftime('%Y-%m-%d %H:%M')
+    runs['period'] = runs['start_date'].dt.strftime('%Y-%m-%d') + ' to ' + runs['end_date'].dt.strftime('%Y-%m-%d')
+    runs['avg_win_rate'] = runs['avg_win_rate'].fillna(0).round(1)
+    runs['avg_return'] = runs['avg_return'].fillna(0).round(2)
+    
+    return runs.rename(columns=HISTORY_COLUMNS)[list(HISTORY_COLUMNS.values())]
+
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_backtest_history(last_backtest_id, limit=10):
+    """
+    Cached get_backtest_history shared by every page.
+    
+    Args:
+        last_backtest_id (int): ID of the latest saved run; a new save re-queries
+        limit (int): Number of recent runs to retrieve
+    
+    Returns:
+        pd.DataFrame: Historical backtest runs
+    """
+    return get_backtest_history(limit=limit)
 
 def get_backtest_details(backtest_id):
     """
@@ -268,26 +309,54 @@ def get_ticker_statistics(ticker, days=30):
     try:
         cutoff_date = datetime.utcnow() - pd.Timedelta(days=days)
         
-        # Get recent performance records for this ticker
-        performances = db.query(TickerPerformance).join(BacktestRun).filter(
-            TickerPerformance.ticker == ticker,
-            BacktestRun.run_date >= cutoff_date
-        ).all()
+        def in_scope(query):
+            """Restrict a query to this ticker's results from recent runs"""
+            return query.join(
+                BacktestRun, BacktestRun.id == TickerPerformance.backtest_run_id
+            ).filter(
+                TickerPerformance.ticker == ticker,
+                BacktestRun.run_date >= cutoff_date
+            )
+        
+        # Aggregate in the database so only one row comes back
+        returns = TickerPerformance.avg_return_pct
+        aggregates = [
+            func.count(TickerPerformance.id),
+            func.avg(returns),
+            func.avg(TickerPerformance.win_rate_pct),
+            func.max(returns),
+            func.min(returns)
+        ]
+        use_stddev = engine.dialect.name == 'postgresql'
+        if use_stddev:
+            aggregates.append(func.stddev_samp(returns))
+        else:
+            # No portable stddev aggregate: sum squared deviations from the mean in a
+            # scalar subquery, which avoids the cancellation of sum(x*x) - n*mean**2
+            mean_return = in_scope(db.query(func.avg(returns))).scalar_subquery().correlate(None)
+            deviation = returns - mean_return
+            aggregates.append(func.sum(deviation * deviation))
+        
+        count, avg_return, avg_win_rate, best, worst, spread = in_scope(db.query(*aggregates)).one()
         
-        if not performances:
+        if not count:
             return {}
         
-        returns = [p.avg_return_pct for p in performances]
-        win_rates = [p.win_rate_pct for p in performances]
+        if count < 2 or spread is None:
+            std_return = float('nan')
+        elif use_stddev:
+            std_return = float(spread)
+        else:
+            std_return = float(np.sqrt(max(spread, 0.0) / (count - 1)))
         
         return {
             'ticker': ticker,
-            'backtest_count': len(performances),
-            'avg_return': round(sum(returns) / len(returns), 2),
-            'avg_win_rate': round(sum(win_rates) / len(win_rates), 1),
-            'best_performance': round(max(returns), 2),
-            'worst_performance': round(min(returns), 2),
-            'consistency_score': round(100 - (pd.Series(returns).std() * 10), 1)  # Lower std = higher consistency
+            'backtest_count': count,
+            'avg_return': round(avg_return, 2),
+            'avg_win_rate': round(avg_win_rate, 1),
+            'best_performance': round(best, 2),
+            'worst_performance': round(worst, 2),
+            'consistency_score': round(100 - (std_return * 10), 1)  # Lower std = higher consistency
         }
     
     finally:
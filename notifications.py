@@ -1,23 +1,80 @@
 import os
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import queue
+import threading
+import time
+from email.message import EmailMessage
 from twilio.rest import Client
-from datetime import datetime
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import pandas as pd
 import streamlit as st
+from simple_strategy import calculate_simple_rsi
+from utils import compute_features, trailing_run_length
+from price_cache import get_recent_prices
 
 # Twilio configuration
 TWILIO_ACCOUNT_SID = os.environ.get("TWILIO_ACCOUNT_SID")
 TWILIO_AUTH_TOKEN = os.environ.get("TWILIO_AUTH_TOKEN")
 TWILIO_PHONE_NUMBER = os.environ.get("TWILIO_PHONE_NUMBER")
 
+# Environment variables don't change mid-process, so check them once
+TWILIO_CONFIGURED = all([TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_PHONE_NUMBER])
+
+# One Twilio client per process so its HTTPS session is kept alive between messages
+_twilio_client = None
+_twilio_lock = threading.Lock()
+
+def _get_twilio_client():
+    """Return the shared Twilio client, creating it on first use"""
+    global _twilio_client
+    if _twilio_client is None:
+        with _twilio_lock:
+            if _twilio_client is None:
+                _twilio_client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+    return _twilio_client
+
+class TokenBucket:
+    """Thread-safe token bucket that smooths bursts to a steady rate"""
+    
+    def __init__(self, rate_per_sec=1.0, capacity=5):
+        self.rate_per_sec = rate_per_sec
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping until one is available"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate_per_sec)
+                self.updated = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                wait_time = (1 - self.tokens) / self.rate_per_sec
+            
+            time.sleep(wait_time)
+
+# Twilio long-code numbers accept about one message per second
+_sms_bucket = TokenBucket(rate_per_sec=1.0, capacity=5)
+
+# SMTP connections shared by one signal run
+SMTP_POOL_SIZE = 3
+
 def send_sms_notification(to_phone_number, message):
     """Send SMS notification using Twilio"""
     try:
-        if not all([TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_PHONE_NUMBER]):
+        if not TWILIO_CONFIGURED:
             return False, "Twilio credentials not configured"
         
-        client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+        client = _get_twilio_client()
+        _sms_bucket.acquire()
         
         message = client.messages.create(
             body=message,
@@ -30,147 +87,274 @@ def send_sms_notification(to_phone_number, message):
     except Exception as e:
         return False, f"Failed to send SMS: {str(e)}"
 
-def send_email_notification(to_email, subject, message, smtp_server="smtp.gmail.com", smtp_port=587, from_email=None, from_password=None):
-    """Send email notification"""
+def _build_email(from_email, to_email, subject, message):
+    """Build a plain-text email message (single part, no multipart wrapper)"""
+    msg = EmailMessage()
+    msg['From'] = from_email
+    msg['To'] = to_email
+    msg['Subject'] = subject
+    msg.set_content(message)
+    return msg
+
+class SMTPSession:
+    """SMTP connection that is opened once and reused for several emails"""
+    
+    def __init__(self, from_email, from_password, smtp_server="smtp.gmail.com", smtp_port=587):
+        self.from_email = from_email
+        self.from_password = from_password
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.server = None
+    
+    def _connect(self):
+        """Open the connection, upgrade to TLS and log in; only a logged-in connection is kept"""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        try:
+            server.starttls()
+            server.login(self.from_email, self.from_password)
+        except Exception:
+            server.close()
+            raise
+        self.server = server
+    
+    def send(self, to_email, subject, message):
+        """Send one email, connecting on first use and reconnecting once if the server dropped us"""
+        msg = _build_email(self.from_email, to_email, subject, message)
+        
+        if self.server is None:
+            self._connect()
+        
+        try:
+            self.server.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            self.server = None
+            self._connect()
+            self.server.send_message(msg)
+    
+    def close(self):
+        """Close the connection if it is open"""
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except Exception:
+                pass
+            self.server = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class SMTPPool:
+    """Bounded pool of SMTP sessions; each connection is recycled after max_msgs_per_conn messages"""
+    
+    def __init__(self, from_email, from_password, size=3, max_msgs_per_conn=100,
+                 smtp_server="smtp.gmail.com", smtp_port=587):
+        self.max_msgs_per_conn = max_msgs_per_conn
+        self._idle = queue.Queue()
+        
+        # Sessions connect on first send, so idle slots cost nothing
+        for _ in range(size):
+            self._idle.put((SMTPSession(from_email, from_password, smtp_server, smtp_port), 0))
+    
+    @contextmanager
+    def acquire(self):
+        """Borrow a session, blocking until one is free"""
+        session, sent = self._idle.get()
+        if sent >= self.max_msgs_per_conn:
+            session.close()  # reconnects on the next send
+            sent = 0
+        
+        try:
+            yield session
+        finally:
+            self._idle.put((session, sent + 1))
+    
+    def close(self):
+        """Close every idle session"""
+        while True:
+            try:
+                session, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def send_email_notification(to_email, subject, message, smtp_server="smtp.gmail.com", smtp_port=587, from_email=None, from_password=None, session=None):
+    """Send email notification, reusing an open SMTPSession if one is given"""
     try:
+        if session is not None:
+            session.send(to_email, subject, message)
+            return True, "Email sent successfully"
+        
         if not from_email or not from_password:
             return False, "Email credentials not provided"
         
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = from_email
-        msg['To'] = to_email
-        msg['Subject'] = subject
-        
-        # Add body to email
-        msg.attach(MIMEText(message, 'plain'))
-        
         # Gmail SMTP configuration
-        server = smtplib.SMTP(smtp_server, smtp_port)
-        server.starttls()
-        server.login(from_email, from_password)
-        text = msg.as_string()
-        server.sendmail(from_email, to_email, text)
-        server.quit()
+        with SMTPSession(from_email, from_password, smtp_server, smtp_port) as smtp_session:
+            smtp_session.send(to_email, subject, message)
         
         return True, "Email sent successfully"
     
     except Exception as e:
         return False, f"Failed to send email: {str(e)}"
 
-def format_trading_signal(ticker, signal_type, price, rsi, red_days, strategy_params):
-    """Format trading signal message"""
+def _format_static_params(strategy_params):
+    """Format the strategy parameters block, which is the same for every signal in a run"""
+    return "\n".join([
+        "Strategy Parameters:",
+        f"- RSI Threshold: {strategy_params['rsi_threshold']}",
+        f"- Red Days Required: {strategy_params['red_days']}",
+        f"- Exit Percentage: {strategy_params['exit_percentage']*100:.1f}%",
+    ])
+
+def format_trading_signal(ticker, signal_type, price, rsi, red_days, strategy_params, static_block=None):
+    """Format trading signal message (pass static_block to reuse a pre-formatted parameters block)"""
+    if static_block is None:
+        static_block = _format_static_params(strategy_params)
+    
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    message = f"""
-🚨 TRADING SIGNAL ALERT 🚨
-
-Ticker: {ticker}
-Signal: {signal_type.upper()}
-Price: ${price:.2f}
-RSI: {rsi:.1f}
-Consecutive Red Days: {red_days}
+    return "\n".join([
+        "🚨 TRADING SIGNAL ALERT 🚨",
+        "",
+        f"Ticker: {ticker}",
+        f"Signal: {signal_type.upper()}",
+        f"Price: ${price:.2f}",
+        f"RSI: {rsi:.1f}",
+        f"Consecutive Red Days: {red_days}",
+        "",
+        static_block,
+        "",
+        f"Timestamp: {timestamp}",
+        "",
+        "⚠️ This is an automated signal. Please conduct your own analysis before trading.",
+    ])
 
-Strategy Parameters:
-- RSI Threshold: {strategy_params['rsi_threshold']}
-- Red Days Required: {strategy_params['red_days']}
-- Exit Percentage: {strategy_params['exit_percentage']*100:.1f}%
-
-Timestamp: {timestamp}
-
-⚠️ This is an automated signal. Please conduct your own analysis before trading.
-    """.strip()
+def _ticker_signal(ticker, data, strategy_params):
+    """Return the BUY signal for one ticker's recent data, or None"""
+    if data is None or data.shape[0] < 15:
+        return None
+    
+    # Get latest data
+    closes = data['Close'].values
+    latest_price = closes[-1]
+    
+    # Calculate RSI
+    rsi_values = calculate_simple_rsi(closes)
+    latest_rsi = rsi_values[-1]
+    
+    if pd.isna(latest_rsi):
+        return None
     
-    return message
+    # Only the run ending at the latest bar matters, so skip the per-bar run lengths
+    consecutive_red = trailing_run_length(compute_features(closes)['red'])
+    
+    # Check for buy signal
+    if (consecutive_red >= strategy_params['red_days'] and 
+        latest_rsi < strategy_params['rsi_threshold']):
+        
+        return {
+            'ticker': ticker,
+            'signal_type': 'BUY',
+            'price': float(latest_price),
+            'rsi': float(latest_rsi),
+            'red_days': consecutive_red,
+            'timestamp': datetime.now()
+        }
+    
+    return None
 
-def check_live_signals(tickers, strategy_params, notification_settings):
-    """Check for live trading signals and send notifications"""
-    import yfinance as yf
-    from simple_strategy import calculate_simple_rsi
-    import pandas as pd
-    from datetime import datetime, timedelta
+def check_live_signals(tickers, strategy_params, notification_settings, force_refresh=False):
+    """Check for live trading signals and send notifications (force_refresh skips cached bars, for manual checks)"""
+    if not tickers:
+        return []
     
-    signals_found = []
+    # Get recent data (last 30 days for RSI calculation); cached bars are reused only
+    # within half the monitor's check interval, so each scheduled check sees new bars
+    if force_refresh:
+        ttl = timedelta(0)
+    else:
+        ttl = timedelta(minutes=notification_settings.get('check_interval', 30)) / 2
     
+    try:
+        recent_data = get_recent_prices(tickers, days=30, ttl=ttl)
+    except Exception as e:
+        print(f"Error downloading watchlist data: {e}")
+        return []
+    
+    signals_found = []
     for ticker in tickers:
         try:
-            # Get recent data (last 30 days for RSI calculation)
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=30)
-            
-            data = yf.download(ticker, start=start_date, end=end_date, progress=False)
-            
-            if data is None or data.shape[0] < 15:
-                continue
-            
-            # Fix multi-level columns
-            if isinstance(data.columns, pd.MultiIndex):
-                data.columns = data.columns.droplevel(1)
-            
-            # Get latest data
-            closes = data['Close'].values
-            latest_price = closes[-1]
-            
-            # Calculate RSI
-            rsi_values = calculate_simple_rsi(closes)
-            latest_rsi = rsi_values[-1]
-            
-            if pd.isna(latest_rsi):
-                continue
-            
-            # Calculate consecutive red days
-            consecutive_red = 0
-            for i in range(len(closes)-1, 0, -1):
-                if closes[i] < closes[i-1]:
-                    consecutive_red += 1
-                else:
-                    break
-            
-            # Check for buy signal
-            if (consecutive_red >= strategy_params['red_days'] and 
-                latest_rsi < strategy_params['rsi_threshold']):
-                
-                signal = {
-                    'ticker': ticker,
-                    'signal_type': 'BUY',
-                    'price': latest_price,
-                    'rsi': latest_rsi,
-                    'red_days': consecutive_red,
-                    'timestamp': datetime.now()
-                }
-                
-                signals_found.append(signal)
-                
-                # Send notifications
-                message = format_trading_signal(
-                    ticker, 'BUY', latest_price, latest_rsi, 
-                    consecutive_red, strategy_params
-                )
-                
-                # Send SMS if configured
-                if notification_settings.get('sms_enabled') and notification_settings.get('phone_number'):
-                    send_sms_notification(notification_settings['phone_number'], message)
-                
-                # Send Email if configured
-                if (notification_settings.get('email_enabled') and 
-                    notification_settings.get('email_address') and
-                    notification_settings.get('sender_email') and
-                    notification_settings.get('sender_password')):
-                    
-                    send_email_notification(
-                        notification_settings['email_address'],
-                        f"Trading Signal: {ticker} BUY Alert",
-                        message,
-                        from_email=notification_settings['sender_email'],
-                        from_password=notification_settings['sender_password']
-                    )
-        
+            signal = _ticker_signal(ticker, recent_data.get(ticker), strategy_params)
         except Exception as e:
             print(f"Error checking signals for {ticker}: {e}")
             continue
+        
+        if signal is not None:
+            signals_found.append(signal)
+    
+    sms_enabled = notification_settings.get('sms_enabled') and notification_settings.get('phone_number')
+    email_enabled = (notification_settings.get('email_enabled') and 
+                     notification_settings.get('email_address') and
+                     notification_settings.get('sender_email') and
+                     notification_settings.get('sender_password'))
+    
+    static_block = _format_static_params(strategy_params)
+    messages = [
+        (signal['ticker'], format_trading_signal(
+            signal['ticker'], 'BUY', signal['price'], signal['rsi'], 
+            signal['red_days'], strategy_params, static_block
+        ))
+        for signal in signals_found
+    ]
+    
+    def send_all_sms():
+        for ticker, message in messages:
+            send_sms_notification(notification_settings['phone_number'], message)
+    
+    def send_email(ticker, message):
+        with smtp_pool.acquire() as smtp_session:
+            send_email_notification(
+                notification_settings['email_address'],
+                f"Trading Signal: {ticker} BUY Alert",
+                message,
+                session=smtp_session
+            )
+    
+    def send_all_email():
+        # A few reused SMTP connections for the whole run, each used by one thread at a time
+        with ThreadPoolExecutor(max_workers=SMTP_POOL_SIZE) as email_executor:
+            list(email_executor.map(lambda item: send_email(*item), messages))
+    
+    # SMS goes out in watchlist order; the two channels run side by side
+    channels = []
+    if messages and sms_enabled:
+        channels.append(send_all_sms)
+    if messages and email_enabled:
+        channels.append(send_all_email)
+    
+    if channels:
+        with SMTPPool(notification_settings.get('sender_email'),
+                      notification_settings.get('sender_password'),
+                      size=SMTP_POOL_SIZE) as smtp_pool:
+            with ThreadPoolExecutor(max_workers=len(channels)) as executor:
+                for future in [executor.submit(channel) for channel in channels]:
+                    future.result()
     
     return signals_found
 
+@st.cache_data(show_spinner=False)
+def _parse_watchlist(watchlist_input):
+    """Split a comma-separated watchlist into unique upper-case tickers, keeping their order"""
+    return list(dict.fromkeys(ticker.strip().upper() for ticker in watchlist_input.split(",") if ticker.strip()))
+
 def render_notification_settings():
     """Render notification settings in Streamlit sidebar"""
     st.sidebar.header("📱 Notification Settings")
@@ -203,7 +387,7 @@ def render_notification_settings():
         )
         st.session_state.notification_settings['phone_number'] = phone_number
         
-        if not all([TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_PHONE_NUMBER]):
+        if not TWILIO_CONFIGURED:
             st.sidebar.warning("⚠️ Twilio credentials required for SMS notifications")
     
     # Email Settings
@@ -242,8 +426,7 @@ def render_notification_settings():
     )
     
     if watchlist_input:
-        watchlist = [ticker.strip().upper() for ticker in watchlist_input.split(",") if ticker.strip()]
-        st.session_state.notification_settings['watchlist'] = watchlist
+        st.session_state.notification_settings['watchlist'] = _parse_watchlist(watchlist_input)
     
     # Check interval
     check_interval = st.sidebar.selectbox(
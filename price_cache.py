@@ -0,0 +1,235 @@
+import os
+import hashlib
+import time
+import numpy as np
+import pandas as pd
+from datetime import date, timedelta
+
+# On-disk cache of downloaded price history, one parquet file per request
+CACHE_DIR = os.path.join('.cache', 'yf')
+
+# Ranges that end within this window may still gain bars, so they expire
+RECENT_WINDOW = timedelta(days=7)
+RECENT_TTL = timedelta(days=1)
+
+# Rolling per-ticker history for live monitoring; only the tail is re-fetched once stale
+TAIL_DIR = os.path.join(CACHE_DIR, 'tail')
+TAIL_TTL = timedelta(minutes=15)
+
+# A rolling file starting this long after the window start (weekends, holidays) still covers it
+TAIL_START_SLACK = pd.Timedelta(days=5)
+
+def split_ticker_frames(raw, tickers):
+    """
+    Split a group_by='ticker' download into one DataFrame per ticker.
+
+    Args:
+        raw (pd.DataFrame): Result of yf.download(..., group_by='ticker')
+        tickers (list): Tickers that were requested
+
+    Returns:
+        dict: Non-empty OHLCV DataFrame per ticker
+    """
+    frames = {}
+    if raw is None or raw.empty:
+        return frames
+
+    # Older yfinance versions return flat columns for a single ticker
+    grouped = isinstance(raw.columns, pd.MultiIndex)
+    available = set(raw.columns.get_level_values(0)) if grouped else set()
+
+    for ticker in tickers:
+        if grouped:
+            if ticker not in available:
+                continue
+            data = raw[ticker].dropna()
+        else:
+            data = raw.dropna()
+
+        if not data.empty:
+            # Signals are thresholded, so float32 precision is plenty and halves memory traffic
+            price_columns = [col for col in ('Open', 'High', 'Low', 'Close', 'Volume') if col in data.columns]
+            frames[ticker] = data.astype({col: np.float32 for col in price_columns}, copy=False)
+
+    return frames
+
+def _cache_path(ticker, start, end, interval):
+    """Path of the cache file for one (ticker, start, end, interval) request"""
+    key = hashlib.md5(f"{ticker}|{start}|{end}|{interval}".encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.parquet")
+
+def _is_fresh(path, end):
+    """Historical ranges never expire; recent ones expire after RECENT_TTL"""
+    if not os.path.exists(path):
+        return False
+
+    if pd.Timestamp(end).date() < date.today() - RECENT_WINDOW:
+        return True
+
+    age = time.time() - os.path.getmtime(path)
+    return age < RECENT_TTL.total_seconds()
+
+def load_prices(ticker, start, end, interval='1d'):
+    """
+    Read cached price history for a ticker.
+
+    Args:
+        ticker (str): Stock ticker symbol
+        start (str): Start date (ISO format)
+        end (str): End date (ISO format, exclusive)
+        interval (str): Bar interval (default: '1d')
+
+    Returns:
+        pd.DataFrame: Cached data, or None on a miss
+    """
+    path = _cache_path(ticker, start, end, interval)
+    if not _is_fresh(path, end):
+        return None
+
+    try:
+        return pd.read_parquet(path)
+    except Exception:
+        return None
+
+def store_prices(ticker, start, end, data, interval='1d'):
+    """
+    Write price history for a ticker to the cache. Failures are ignored.
+
+    Args:
+        ticker (str): Stock ticker symbol
+        start (str): Start date (ISO format)
+        end (str): End date (ISO format, exclusive)
+        data (pd.DataFrame): OHLCV data to cache
+        interval (str): Bar interval (default: '1d')
+    """
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        data.to_parquet(_cache_path(ticker, start, end, interval))
+    except Exception:
+        pass
+
+def get_prices(tickers, start, end, interval='1d'):
+    """
+    Get price history for several tickers, downloading only cache misses.
+
+    Misses are fetched together in one batched yf.download call and written
+    back to the cache.
+
+    Args:
+        tickers (list): Stock ticker symbols
+        start (str): Start date (ISO format)
+        end (str): End date (ISO format, exclusive)
+        interval (str): Bar interval (default: '1d')
+
+    Returns:
+        dict: OHLCV DataFrame per ticker that has data
+    """
+    frames = {}
+    missing = []
+
+    for ticker in tickers:
+        cached = load_prices(ticker, start, end, interval)
+        if cached is not None:
+            frames[ticker] = cached
+        else:
+            missing.append(ticker)
+
+    if missing:
+        import yfinance as yf
+        
+        raw = yf.download(missing, start=start, end=end, interval=interval,
+                          group_by='ticker', threads=True, progress=False)
+        downloaded = split_ticker_frames(raw, missing)
+
+        for ticker, data in downloaded.items():
+            store_prices(ticker, start, end, data, interval)
+
+        frames.update(downloaded)
+
+    return frames
+
+def _tail_path(ticker, interval):
+    """Path of the rolling history file for a ticker"""
+    return os.path.join(TAIL_DIR, f"{ticker}_{interval}.parquet")
+
+def _load_tail(ticker, interval):
+    """Read a ticker's rolling history and its age in seconds, or (None, None)"""
+    path = _tail_path(ticker, interval)
+    try:
+        return pd.read_parquet(path), time.time() - os.path.getmtime(path)
+    except Exception:
+        return None, None
+
+def get_recent_prices(tickers, days=30, interval='1d', ttl=TAIL_TTL):
+    """
+    Get the last `days` of price history for several tickers, re-downloading only the tail.
+    
+    Each ticker keeps a rolling parquet file trimmed to the last `days`. Files
+    younger than `ttl` are used as is; older ones are topped up from their last
+    cached bar (which may have been partial) in one batched yf.download call,
+    de-duplicated, trimmed and rewritten. Pass ttl=timedelta(0) to always top up.
+    
+    Args:
+        tickers (list): Stock ticker symbols
+        days (int): Calendar days of history to return (default: 30)
+        interval (str): Bar interval (default: '1d')
+        ttl (timedelta): How long a file is served without re-fetching
+    
+    Returns:
+        dict: OHLCV DataFrame per ticker that has data
+    """
+    window_start = pd.Timestamp.now().normalize() - pd.Timedelta(days=days)
+    end = (pd.Timestamp.now().normalize() + pd.Timedelta(days=1)).date().isoformat()
+    
+    frames = {}
+    stale = {}  # fetch start date -> tickers
+    
+    for ticker in tickers:
+        cached, age = _load_tail(ticker, interval)
+        # Files cut to a shorter window than requested are re-fetched in full
+        if cached is not None and not cached.empty and cached.index[0] <= window_start + TAIL_START_SLACK:
+            frames[ticker] = cached
+            if age < ttl.total_seconds():
+                continue
+            fetch_from = max(cached.index[-1], window_start)
+        else:
+            if cached is not None and not cached.empty:
+                frames[ticker] = cached  # still served if the re-fetch fails
+            fetch_from = window_start
+        stale.setdefault(fetch_from.date().isoformat(), []).append(ticker)
+    
+    if stale:
+        import yfinance as yf
+        
+        os.makedirs(TAIL_DIR, exist_ok=True)
+        for start, batch in stale.items():
+            try:
+                raw = yf.download(batch, start=start, end=end, interval=interval,
+                                  group_by='ticker', threads=True, progress=False)
+            except Exception:
+                continue  # keep serving whatever is cached
+            
+            downloaded = split_ticker_frames(raw, batch)
+            for ticker, fresh in downloaded.items():
+                merged = pd.concat([frames[ticker], fresh]) if ticker in frames else fresh
+                merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+                merged = merged.loc[merged.index >= window_start]
+                frames[ticker] = merged
+                try:
+                    merged.to_parquet(_tail_path(ticker, interval))
+                except Exception:
+                    pass
+            
+            # No new bars (e.g. market closed): mark the file as checked so the TTL applies again
+            for ticker in batch:
+                if ticker not in downloaded and ticker in frames:
+                    try:
+                        os.utime(_tail_path(ticker, interval))
+                    except OSError:
+                        pass
+    
+    return {
+        ticker: data.loc[data.index >= window_start]
+        for ticker, data in frames.items()
+        if (data.index >= window_start).any()
+    }
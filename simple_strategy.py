@@ -2,40 +2,147 @@ import pandas as pd
 import numpy as np
 import warnings
 from datetime import datetime
+from _njit import njit, NUMBA_AVAILABLE
+from utils import compute_features, consecutive_red_days
+
+__all__ = ['calculate_simple_rsi', 'simple_backtest', 'SimpleStrategy']
 
 # Suppress numpy warnings
 warnings.filterwarnings('ignore', category=RuntimeWarning)
 
-def calculate_simple_rsi(prices, period=14):
-    """Simple RSI calculation without pandas boolean operations"""
-    prices = np.array(prices)
-    deltas = np.diff(prices)
+@njit(cache=True)
+def _wilder_rsi_kernel(prices, period):
+    """Wilder RSI: seed with the mean of the first `period` moves, then smooth recursively"""
+    n = len(prices)
+    rsi_values = np.full(n, np.nan)
+    if n <= period:
+        return rsi_values
     
-    gains = np.where(deltas > 0, deltas, 0)
-    losses = np.where(deltas < 0, -deltas, 0)
-    
-    # Initialize RSI array with correct length
-    rsi_values = [np.nan] * len(prices)
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        delta = prices[i] - prices[i - 1]
+        if delta > 0:
+            avg_gain += delta
+        else:
+            avg_loss -= delta
+    avg_gain /= period
+    avg_loss /= period
     
-    # Calculate RSI starting from period+1 index
-    for i in range(period, len(prices)):
-        # Get gains and losses for the period
-        period_gains = gains[i-period:i]
-        period_losses = losses[i-period:i]
-        
-        avg_gain = np.mean(period_gains) if len(period_gains) > 0 else 0
-        avg_loss = np.mean(period_losses) if len(period_losses) > 0 else 0
+    for i in range(period, n):
+        if i > period:
+            delta = prices[i] - prices[i - 1]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
         
+        # No losses in the smoothed window pins RSI at 100
         if avg_loss == 0:
-            rsi_values[i] = 100
+            rsi_values[i] = 100.0
         else:
-            rs = avg_gain / avg_loss
-            rsi_values[i] = 100 - (100 / (1 + rs))
+            rsi_values[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    
+    return rsi_values
+
+def calculate_simple_rsi(prices, period=14):
+    """Wilder RSI over a price array; the first `period` values are NaN"""
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    n = len(prices)
+    if NUMBA_AVAILABLE or n <= period:
+        return _wilder_rsi_kernel(prices, period)
+    
+    # Without numba the kernel is a Python loop; Wilder smoothing is ewm(alpha=1/period)
+    # seeded with the mean of the first `period` moves
+    delta = np.diff(prices)
+    gains = np.maximum(delta[period - 1:], 0.0)
+    losses = np.maximum(-delta[period - 1:], 0.0)
+    gains[0] = np.maximum(delta[:period], 0.0).mean()
+    losses[0] = np.maximum(-delta[:period], 0.0).mean()
+    avg_gain = pd.Series(gains).ewm(alpha=1.0 / period, adjust=False).mean().to_numpy()
+    avg_loss = pd.Series(losses).ewm(alpha=1.0 / period, adjust=False).mean().to_numpy()
     
+    rsi_values = np.full(n, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi_values[period:] = np.where(avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
     return rsi_values
 
-def simple_backtest(data, rsi_threshold=30, exit_percentage=0.05, red_days=2):
-    """Simple backtesting function without complex pandas operations"""
+@njit(cache=True)
+def _walk_trades(closes, rsi_values, entries, exit_percentage):
+    """
+    Walk a single long position through the series.
+    
+    Bars without RSI are skipped. A position opens on an entry bar and closes on
+    the first later bar whose move from the buy price reaches exit_percentage, or
+    on the last bar. Returns (buy indices, sell indices, positions opened).
+    """
+    n = len(closes)
+    buy_idx = np.empty(n, dtype=np.int64)
+    sell_idx = np.empty(n, dtype=np.int64)
+    num_trades = 0
+    opened = 0
+    
+    i = 0
+    while i < n:
+        if np.isnan(rsi_values[i]) or not entries[i]:
+            i += 1
+            continue
+        
+        opened += 1
+        buy_price = closes[i]
+        j = i + 1
+        while j < n:
+            if not np.isnan(rsi_values[j]):
+                if abs((closes[j] - buy_price) / buy_price) >= exit_percentage or j == n - 1:
+                    break
+            j += 1
+        
+        if j >= n:
+            break  # still open at the end of the data
+        
+        buy_idx[num_trades] = i
+        sell_idx[num_trades] = j
+        num_trades += 1
+        i = j + 1
+    
+    return buy_idx[:num_trades], sell_idx[:num_trades], opened
+
+def _walk_trades_vectorized(closes, rsi_values, entries, exit_percentage):
+    """
+    Same walk as _walk_trades for when numba is missing.
+    
+    Loops once per trade rather than once per bar: each exit is the first hit
+    in a vectorized scan of the bars after the entry.
+    """
+    n = len(closes)
+    valid = ~np.isnan(rsi_values)
+    candidates = np.flatnonzero(valid & entries)
+    buy_idx = []
+    sell_idx = []
+    opened = 0
+    
+    k = 0
+    while k < len(candidates):
+        i = candidates[k]
+        opened += 1
+        buy_price = closes[i]
+        
+        stops = valid[i + 1:] & (np.abs((closes[i + 1:] - buy_price) / buy_price) >= exit_percentage)
+        if stops.size and valid[n - 1]:
+            stops[-1] = True
+        hits = np.flatnonzero(stops)
+        if hits.size == 0:
+            break  # still open at the end of the data
+        
+        j = i + 1 + hits[0]
+        buy_idx.append(i)
+        sell_idx.append(j)
+        k = np.searchsorted(candidates, j + 1)
+    
+    return np.array(buy_idx, dtype=np.int64), np.array(sell_idx, dtype=np.int64), opened
+
+def simple_backtest(data, rsi_threshold=30, exit_percentage=0.05, red_days=2, rsi_values=None, features=None):
+    """Simple backtesting function without complex pandas operations (pass rsi_values/features to reuse them)"""
     if len(data) < 20:  # Need minimum data
         return []
     
@@ -43,63 +150,40 @@ def simple_backtest(data, rsi_threshold=30, exit_percentage=0.05, red_days=2):
     dates = data.index.tolist()
     closes = data['Close'].values
     
-    # Calculate RSI
-    rsi_values = calculate_simple_rsi(closes)
+    # Calculate RSI unless the caller already has it
+    if rsi_values is None:
+        rsi_values = calculate_simple_rsi(closes)
     
-    # Calculate consecutive red days
-    consecutive_red = [0]  # First day is 0
-    for i in range(1, len(closes)):
-        if closes[i] < closes[i-1]:  # Red day
-            consecutive_red.append(consecutive_red[i-1] + 1)
-        else:
-            consecutive_red.append(0)
+    # Calculate consecutive red days from the shared red-day mask
+    if features is None:
+        features = compute_features(closes)
+    consecutive_red = consecutive_red_days(closes, features['red'])
+    
+    # Walk entries and exits in a compiled loop, then build trade records
+    entries = (consecutive_red >= red_days) & (np.asarray(rsi_values) < rsi_threshold)
+    walk_trades = _walk_trades if NUMBA_AVAILABLE else _walk_trades_vectorized
+    buy_idx, sell_idx, buy_signals = walk_trades(
+        np.asarray(closes, dtype=np.float64),
+        np.asarray(rsi_values, dtype=np.float64),
+        entries,
+        exit_percentage
+    )
     
-    # Find trading signals
     trades = []
-    position = None
-    buy_signals = 0
-    
-    for i in range(len(dates)):
-        current_date = dates[i]
-        current_price = closes[i]
-        current_rsi = rsi_values[i]
-        current_red_days = consecutive_red[i]
-        
-        # Skip if we don't have RSI data yet
-        if np.isnan(current_rsi):
-            continue
+    for i, j in zip(buy_idx, sell_idx):
+        buy_price = float(closes[i])
+        return_pct = (closes[j] - buy_price) / buy_price
         
-        # Check for buy signal
-        if position is None:
-            if current_red_days >= red_days and current_rsi < rsi_threshold:
-                buy_signals += 1
-                position = {
-                    'buy_date': current_date,
-                    'buy_price': current_price,
-                    'ticker': 'STOCK'
-                }
-        
-        # Check for sell signal
-        elif position is not None:
-            return_pct = (current_price - position['buy_price']) / position['buy_price']
-            
-            # Sell if we hit target or it's the last day
-            if abs(return_pct) >= exit_percentage or i == len(dates) - 1:
-                days_held = (current_date - position['buy_date']).days
-                
-                trade = {
-                    'ticker': position['ticker'],
-                    'buy_date': position['buy_date'],
-                    'buy_price': position['buy_price'],
-                    'sell_date': current_date,
-                    'sell_price': current_price,
-                    'return_pct': return_pct * 100,
-                    'days_held': days_held,
-                    'exit_reason': 'target_hit' if abs(return_pct) >= exit_percentage else 'end_of_data'
-                }
-                
-                trades.append(trade)
-                position = None
+        trades.append({
+            'ticker': 'STOCK',
+            'buy_date': dates[i],
+            'buy_price': buy_price,
+            'sell_date': dates[j],
+            'sell_price': float(closes[j]),
+            'return_pct': float(return_pct * 100),
+            'days_held': (dates[j] - dates[i]).days,
+            'exit_reason': 'target_hit' if abs(return_pct) >= exit_percentage else 'end_of_data'
+        })
     
     # Debug info
     print(f"Debug: Found {buy_signals} buy signals, {len(trades)} completed trades")
@@ -116,13 +200,20 @@ class SimpleStrategy:
         self.red_days = red_days
     
     def backtest(self, data, ticker):
-        """Run simple backtest"""
+        """Run simple backtest, returning (trades, signals, rsi)"""
         try:
+            # Compute RSI and the price features once and share them between the backtest, signals and chart
+            closes = data['Close'].values
+            rsi_values = calculate_simple_rsi(closes)
+            rsi = pd.Series(rsi_values, index=data.index, name='RSI')
+            
             trades = simple_backtest(
                 data, 
                 self.rsi_threshold, 
                 self.exit_percentage, 
-                self.red_days
+                self.red_days,
+                rsi_values,
+                compute_features(closes)
             )
             
             # Update ticker in trades
@@ -131,11 +222,10 @@ class SimpleStrategy:
             
             # Create simple signals dataframe
             signals = data.copy()
-            rsi_values = calculate_simple_rsi(data['Close'].values)
-            signals['RSI'] = rsi_values
+            signals['RSI'] = rsi
             
-            return trades, signals
+            return trades, signals, rsi
         
         except Exception as e:
             print(f"Error in backtest for {ticker}: {e}")
-            return [], data.copy()
\ No newline at end of file
+            return [], data.copy(), pd.Series(np.nan, index=data.index, name='RSI')
\ No newline at end of file
@@ -1,7 +1,7 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from utils import calculate_rsi
+from utils import calculate_rsi, consecutive_red_days
 
 class MeanReversionStrategy:
     """
@@ -34,19 +34,8 @@ class MeanReversionStrategy:
         Returns:
             pd.Series: Number of consecutive red days for each date
         """
-        # Calculate consecutive red days manually to avoid pandas boolean issues
-        consecutive_red = []
-        close_prices = data['Close'].values
-        
-        consecutive_red.append(0)  # First day has 0 consecutive red days
-        
-        for i in range(1, len(close_prices)):
-            if close_prices[i] < close_prices[i-1]:  # Red day
-                consecutive_red.append(consecutive_red[i-1] + 1)
-            else:
-                consecutive_red.append(0)
-        
-        return pd.Series(consecutive_red, index=data.index)
+        # Work on the raw close array to avoid pandas boolean issues
+        return pd.Series(consecutive_red_days(data['Close'].values), index=data.index, copy=False)
     
     def generate_signals(self, data):
         """
@@ -103,22 +92,30 @@ class MeanReversionStrategy:
         trades = []
         position = None  # Current position: None, or dict with buy info
         
-        for i, (date, row) in enumerate(signals.iterrows()):
+        # Pull columns out once; indexing arrays is far cheaper than iterrows
+        dates = signals.index
+        close = signals['Close'].values
+        rsi = signals['RSI'].values
+        buy = signals['Buy_Signal'].values
+        
+        for i in range(len(signals)):
+            date = dates[i]
+            
             # Skip if we don't have enough data for RSI
-            if pd.isna(row['RSI']):
+            if pd.isna(rsi[i]):
                 continue
             
             # Check for buy signal
-            if position is None and row['Buy_Signal']:
+            if position is None and buy[i]:
                 position = {
                     'buy_date': date,
-                    'buy_price': row['Close'],
+                    'buy_price': close[i],
                     'ticker': ticker
                 }
             
             # Check for sell signal (if we have a position)
             elif position is not None:
-                current_price = row['Close']
+                current_price = close[i]
                 buy_price = position['buy_price']
                 
                 # Calculate return percentage
@@ -191,21 +188,24 @@ class MeanReversionStrategy:
                 'avg_days_held': 0
             }
         
-        returns = [trade['return_pct'] for trade in trades]
-        days_held = [trade['days_held'] for trade in trades if trade['days_held'] is not None]
-        
-        winning_trades = [r for r in returns if r > 0]
+        # One pass over the trades into contiguous arrays
+        returns = np.fromiter((trade['return_pct'] for trade in trades), dtype=np.float64, count=len(trades))
+        days_held = np.fromiter(
+            (np.nan if trade['days_held'] is None else trade['days_held'] for trade in trades),
+            dtype=np.float64, count=len(trades)
+        )
+        days_held = days_held[~np.isnan(days_held)]
         
         metrics = {
             'total_trades': len(trades),
-            'win_rate': len(winning_trades) / len(trades) * 100,
-            'avg_return': np.mean(returns),
-            'total_return': np.sum(returns),
-            'best_trade': max(returns) if returns else 0,
-            'worst_trade': min(returns) if returns else 0,
-            'avg_days_held': np.mean(days_held) if days_held else 0,
-            'median_return': np.median(returns) if returns else 0,
-            'std_return': np.std(returns) if returns else 0
+            'win_rate': (returns > 0).mean() * 100,
+            'avg_return': returns.mean(),
+            'total_return': returns.sum(),
+            'best_trade': returns.max(),
+            'worst_trade': returns.min(),
+            'avg_days_held': days_held.mean() if days_held.size else 0,
+            'median_return': np.median(returns),
+            'std_return': returns.std()
         }
         
         return metrics
@@ -1,12 +1,33 @@
 import pandas as pd
 import numpy as np
 import streamlit as st
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-from database import get_backtest_history, get_backtest_details
+from database import cached_backtest_history, get_backtest_details
 from utils import calculate_sharpe_ratio, calculate_max_drawdown
 
+# Backtest history columns used for parameter analysis, and their analysis names
+PARAM_COLUMNS = {
+    'RSI Threshold': 'RSI_Threshold',
+    'Exit %': 'Exit_Percentage',
+    'Red Days': 'Red_Days',
+    'Avg Return (%)': 'Avg_Return',
+    'Avg Win Rate (%)': 'Win_Rate',
+    'Total Trades': 'Total_Trades'
+}
+
+# Radar chart axes and the reasonable benchmark value for each
+RADAR_CATEGORIES = ('Return', 'Win Rate', 'Trade Frequency', 'Risk Ratio', 'Consistency')
+RADAR_BENCHMARKS = (60, 55, 50, 65, 70)
+
+# General recommendations shown on the Strategy Insights tab
+RECOMMENDATIONS = (
+    "Test strategy across different market conditions (2020 crash, 2021 bull run, 2022 bear market)",
+    "Consider adding volume filters to improve entry quality",
+    "Backtest on different timeframes (daily vs weekly signals)",
+    "Monitor correlation with market indices (SPY, QQQ) to understand market dependence",
+    "Consider sector rotation - some sectors may respond better to mean reversion"
+)
+
+@st.cache_data(show_spinner=False)
 def analyze_parameter_performance(history_df):
     """
     Analyze which parameter combinations perform best
@@ -14,21 +35,15 @@ def analyze_parameter_performance(history_df):
     if history_df.empty:
         return None
     
-    # Group by parameters and calculate average metrics
-    param_analysis = []
-    
-    for _, row in history_df.iterrows():
-        param_analysis.append({
-            'RSI_Threshold': row['RSI Threshold'],
-            'Exit_Percentage': row['Exit %'],
-            'Red_Days': row['Red Days'],
-            'Avg_Return': row['Avg Return (%)'],
-            'Win_Rate': row['Avg Win Rate (%)'],
-            'Total_Trades': row['Total Trades'],
-            'Profitable_Ratio': row['Profitable Tickers'] / row['Successful'] if row['Successful'] > 0 else 0
-        })
+    # Rename the parameter/metric columns and derive the profitable ratio column-wise
+    param_analysis = history_df[list(PARAM_COLUMNS)].rename(columns=PARAM_COLUMNS)
     
-    return pd.DataFrame(param_analysis)
+    successful = history_df['Successful'].to_numpy(dtype=np.float64)
+    profitable = history_df['Profitable Tickers'].to_numpy(dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        param_analysis['Profitable_Ratio'] = np.where(successful > 0, profitable / successful, 0.0)
+    
+    return param_analysis
 
 def suggest_parameter_optimization(current_params, param_analysis_df):
     """
@@ -39,10 +54,12 @@ def suggest_parameter_optimization(current_params, param_analysis_df):
     
     suggestions = []
     
-    # Find best performing parameters
-    best_return = param_analysis_df.loc[param_analysis_df['Avg_Return'].idxmax()]
-    best_win_rate = param_analysis_df.loc[param_analysis_df['Win_Rate'].idxmax()]
-    best_profit_ratio = param_analysis_df.loc[param_analysis_df['Profitable_Ratio'].idxmax()]
+    # Find best performing parameters with one column-wise argmax over the metric block
+    metrics = param_analysis_df[['Avg_Return', 'Win_Rate']].to_numpy(dtype=np.float64)
+    best_return_pos, best_win_rate_pos = np.nanargmax(metrics, axis=0)
+    best_return = param_analysis_df.iloc[best_return_pos]
+    best_win_rate = param_analysis_df.iloc[best_win_rate_pos]
+    mean_return = np.nanmean(metrics[:, 0])
     
     # RSI Threshold suggestions
     current_rsi = current_params.get('rsi_threshold', 30)
@@ -52,7 +69,7 @@ def suggest_parameter_optimization(current_params, param_analysis_df):
             'current': current_rsi,
             'suggested': int(best_return['RSI_Threshold']),
             'reason': f"Historical data shows RSI {int(best_return['RSI_Threshold'])} achieved {best_return['Avg_Return']:.2f}% average return",
-            'confidence': 'High' if abs(best_return['Avg_Return'] - param_analysis_df['Avg_Return'].mean()) > 1 else 'Medium'
+            'confidence': 'High' if abs(best_return['Avg_Return'] - mean_return) > 1 else 'Medium'
         })
     
     # Exit Percentage suggestions
@@ -96,27 +113,36 @@ def analyze_market_conditions(backtest_details):
     
     return analysis
 
+@st.cache_data(max_entries=16, show_spinner=False)
 def create_parameter_heatmap(param_analysis_df):
     """
     Create a heatmap showing parameter performance
     """
-    if param_analysis_df is None or param_analysis_df.empty:
+    import plotly.graph_objects as go
+    
+    # A grid needs at least 2x2 cells to say anything, so skip building the figure otherwise
+    if param_analysis_df is None or len(param_analysis_df) < 4:
         return None
     
-    # Create pivot table for heatmap
-    pivot_data = param_analysis_df.pivot_table(
-        values='Avg_Return', 
-        index='RSI_Threshold', 
-        columns='Exit_Percentage', 
-        aggfunc='mean'
+    # Average return per (RSI threshold, exit %) cell via the groupby mean kernel
+    pivot_data = (
+        param_analysis_df
+        .groupby(['RSI_Threshold', 'Exit_Percentage'])['Avg_Return']
+        .mean()
+        .unstack()
     )
+    if min(pivot_data.shape) < 2:
+        return None
+    
+    # Two decimals are all the labels show, so float32 halves the payload without visible loss
+    z = np.round(pivot_data.to_numpy(dtype=np.float64), 2).astype(np.float32)
     
     fig = go.Figure(data=go.Heatmap(
-        z=pivot_data.values,
+        z=z,
         x=pivot_data.columns,
         y=pivot_data.index,
         colorscale='RdYlGn',
-        text=pivot_data.values,
+        text=z,
         texttemplate="%{text:.2f}%",
         colorbar=dict(title="Avg Return (%)")
     ))
@@ -130,36 +156,36 @@ def create_parameter_heatmap(param_analysis_df):
     
     return fig
 
+@st.cache_data(max_entries=16, show_spinner=False)
 def create_performance_radar(current_metrics, benchmarks):
     """
     Create a radar chart comparing current performance to benchmarks
     """
-    categories = ['Return', 'Win Rate', 'Trade Frequency', 'Risk Ratio', 'Consistency']
+    import plotly.graph_objects as go
     
     # Normalize metrics to 0-100 scale for radar chart
-    current_values = [
-        min(100, max(0, (current_metrics.get('avg_return', 0) + 10) * 5)),  # Return (-10% to +10% -> 0-100)
+    raw_values = np.array([
+        (current_metrics.get('avg_return', 0) + 10) * 5,  # Return (-10% to +10% -> 0-100)
         current_metrics.get('win_rate', 50),  # Win rate is already 0-100
-        min(100, current_metrics.get('trade_frequency', 10) * 10),  # Trade frequency
-        min(100, max(0, (2 - current_metrics.get('sharpe_ratio', 0)) * 50)),  # Risk ratio (inverse)
-        min(100, max(0, 100 - current_metrics.get('volatility', 50)))  # Consistency (inverse volatility)
-    ]
-    
-    benchmark_values = [60, 55, 50, 65, 70]  # Reasonable benchmark values
+        current_metrics.get('trade_frequency', 10) * 10,  # Trade frequency
+        (2 - current_metrics.get('sharpe_ratio', 0)) * 50,  # Risk ratio (inverse)
+        100 - current_metrics.get('volatility', 50)  # Consistency (inverse volatility)
+    ], dtype=np.float64)
+    current_values = np.clip(raw_values, 0, 100).tolist()
     
     fig = go.Figure()
     
     fig.add_trace(go.Scatterpolar(
         r=current_values,
-        theta=categories,
+        theta=RADAR_CATEGORIES,
         fill='toself',
         name='Current Strategy',
         line_color='blue'
     ))
     
     fig.add_trace(go.Scatterpolar(
-        r=benchmark_values,
-        theta=categories,
+        r=RADAR_BENCHMARKS,
+        theta=RADAR_CATEGORIES,
         fill='toself',
         name='Target Benchmark',
         line_color='green',
@@ -179,25 +205,25 @@ def create_performance_radar(current_metrics, benchmarks):
     
     return fig
 
-def risk_analysis(trades_data):
+def risk_analysis(trades_df):
     """
-    Perform risk analysis on trade data
+    Perform risk analysis on a trades DataFrame
     """
-    if not trades_data or len(trades_data) == 0:
+    if trades_df is None or trades_df.empty or 'Return (%)' not in trades_df.columns:
         return {}
     
-    returns = [trade.get('Return (%)', 0) for trade in trades_data if 'Return (%)' in trade]
+    returns = trades_df['Return (%)'].to_numpy(dtype=np.float64)
     
-    if not returns:
-        return {}
+    # Reuse the returns array and loss mask for every metric
+    losses = returns < 0
     
     analysis = {
         'max_drawdown': calculate_max_drawdown(returns),
         'sharpe_ratio': calculate_sharpe_ratio(returns),
-        'volatility': np.std(returns),
+        'volatility': returns.std(),
         'var_95': np.percentile(returns, 5),  # Value at Risk (95% confidence)
-        'average_loss': np.mean([r for r in returns if r < 0]) if any(r < 0 for r in returns) else 0,
-        'loss_frequency': len([r for r in returns if r < 0]) / len(returns) * 100
+        'average_loss': returns[losses].mean() if losses.any() else 0,
+        'loss_frequency': losses.mean() * 100
     }
     
     return analysis
@@ -242,29 +268,42 @@ def generate_strategy_insights(param_analysis, risk_metrics, market_analysis):
     
     return insights
 
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_trade_risk(backtest_id):
+    """Trades and risk metrics for a saved backtest, which never changes once written"""
+    _, trades_df = get_backtest_details(backtest_id)
+    risk_metrics = risk_analysis(trades_df)
+    return trades_df, risk_metrics
+
 def render_strategy_playground():
     """
     Main function to render the Strategy Playground
     """
+    import plotly.express as px
+    
     st.header("🎮 Strategy Playground")
     st.markdown("Analyze your strategy performance and discover optimization opportunities.")
     
     # Get historical data
     try:
-        history_df = get_backtest_history(limit=50)
+        history_df = cached_backtest_history(st.session_state.get('last_backtest_id'), limit=50)
         param_analysis = analyze_parameter_performance(history_df)
     except Exception as e:
         st.warning("Unable to load historical data for analysis.")
         history_df = pd.DataFrame()
         param_analysis = None
     
+    # Row counts drive every branch below, so take them once per rerun
+    n_history = len(history_df)
+    n_params = 0 if param_analysis is None else len(param_analysis)
+    
     # Tabs for different analysis views
     tab1, tab2, tab3, tab4 = st.tabs(["📊 Performance Analysis", "🎯 Parameter Optimization", "⚠️ Risk Analysis", "💡 Strategy Insights"])
     
     with tab1:
         st.subheader("Performance Overview")
         
-        if not history_df.empty:
+        if n_history:
             # Performance metrics
             col1, col2, col3, col4 = st.columns(4)
             with col1:
@@ -276,15 +315,14 @@ def render_strategy_playground():
                 st.metric("Average Win Rate", f"{avg_win_rate:.1f}%", delta=f"{avg_win_rate - 50:.1f}%")
             
             with col3:
-                total_backtests = len(history_df)
-                st.metric("Total Backtests", total_backtests)
+                st.metric("Total Backtests", n_history)
             
             with col4:
                 consistency = history_df['Avg Return (%)'].std()
                 st.metric("Consistency (Lower=Better)", f"{consistency:.2f}%")
             
             # Performance trend chart
-            if len(history_df) > 1:
+            if n_history > 1:
                 fig = px.line(history_df, x='Date', y='Avg Return (%)', 
                              title="Strategy Performance Over Time",
                              markers=True)
@@ -300,7 +338,7 @@ def render_strategy_playground():
     with tab2:
         st.subheader("Parameter Optimization")
         
-        if param_analysis is not None and not param_analysis.empty:
+        if n_params:
             # Current parameters (get from session state or use defaults)
             current_params = {
                 'rsi_threshold': st.session_state.get('rsi_threshold', 30),
@@ -327,7 +365,7 @@ def render_strategy_playground():
                 st.success("Your current parameters are well-optimized based on historical data!")
             
             # Parameter distribution charts
-            if len(param_analysis) > 3:
+            if n_params > 3:
                 fig_scatter = px.scatter(param_analysis, x='RSI_Threshold', y='Avg_Return', 
                                        size='Total_Trades', color='Win_Rate',
                                        title="RSI Threshold vs Returns",
@@ -342,13 +380,9 @@ def render_strategy_playground():
         # Get detailed trade data from most recent backtest
         if 'last_backtest_id' in st.session_state and st.session_state.last_backtest_id:
             try:
-                ticker_perf, trades_df = get_backtest_details(st.session_state.last_backtest_id)
+                trades_df, risk_metrics = _cached_trade_risk(st.session_state.last_backtest_id)
                 
                 if not trades_df.empty:
-                    # Convert trades DataFrame to list of dicts for analysis
-                    trades_data = trades_df.to_dict('records')
-                    risk_metrics = risk_analysis(trades_data)
-                    
                     if risk_metrics:
                         # Risk metrics display
                         col1, col2, col3 = st.columns(3)
@@ -363,9 +397,10 @@ def render_strategy_playground():
                                     delta="Loss threshold")
                         
                         # Risk radar chart
+                        returns = trades_df['Return (%)'].to_numpy(dtype=np.float64) if 'Return (%)' in trades_df.columns else None
                         current_metrics = {
-                            'avg_return': trades_df['Return (%)'].mean() if 'Return (%)' in trades_df.columns else 0,
-                            'win_rate': len(trades_df[trades_df['Return (%)'] > 0]) / len(trades_df) * 100 if 'Return (%)' in trades_df.columns else 50,
+                            'avg_return': float(np.nanmean(returns)) if returns is not None else 0,
+                            'win_rate': float((returns > 0).mean() * 100) if returns is not None else 50,
                             'trade_frequency': len(trades_df),
                             'sharpe_ratio': risk_metrics.get('sharpe_ratio', 0),
                             'volatility': risk_metrics.get('volatility', 0)
@@ -398,10 +433,7 @@ def render_strategy_playground():
         
         if 'last_backtest_id' in st.session_state:
             try:
-                _, trades_df = get_backtest_details(st.session_state.last_backtest_id)
-                if not trades_df.empty:
-                    trades_data = trades_df.to_dict('records')
-                    risk_metrics = risk_analysis(trades_data)
+                _, risk_metrics = _cached_trade_risk(st.session_state.last_backtest_id)
             except:
                 pass
         
@@ -415,15 +447,7 @@ def render_strategy_playground():
         
         # Strategy recommendations
         st.markdown("### 📋 General Recommendations")
-        recommendations = [
-            "Test strategy across different market conditions (2020 crash, 2021 bull run, 2022 bear market)",
-            "Consider adding volume filters to improve entry quality",
-            "Backtest on different timeframes (daily vs weekly signals)",
-            "Monitor correlation with market indices (SPY, QQQ) to understand market dependence",
-            "Consider sector rotation - some sectors may respond better to mean reversion"
-        ]
-        
-        for i, rec in enumerate(recommendations, 1):
+        for i, rec in enumerate(RECOMMENDATIONS, 1):
             st.markdown(f"{i}. {rec}")
         
         # Quick strategy tester
@@ -1,7 +1,105 @@
 import pandas as pd
 import numpy as np
-import yfinance as yf
 from datetime import datetime, timedelta
+from _njit import njit, NUMBA_AVAILABLE
+
+
+@njit(cache=True)
+def _rsi_kernel(close, period):
+    """
+    Single-pass RSI using exponentially smoothed gains and losses.
+    
+    Matches ewm(span=period, adjust=False) smoothing of the price deltas.
+    """
+    n = close.shape[0]
+    rsi = np.empty(n, dtype=close.dtype)
+    if n == 0:
+        return rsi
+    
+    alpha = 2.0 / (period + 1.0)
+    avg_gain = 0.0
+    avg_loss = 0.0
+    rsi[0] = np.nan
+    
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        
+        avg_gain = alpha * gain + (1.0 - alpha) * avg_gain
+        avg_loss = alpha * loss + (1.0 - alpha) * avg_loss
+        
+        if avg_loss == 0:
+            rsi[i] = 100.0 if avg_gain > 0 else np.nan
+        else:
+            rsi[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    
+    return rsi
+
+@njit(cache=True)
+def _lttb_kernel(x, y, n_out):
+    """Largest-Triangle-Three-Buckets selection of n_out point indices."""
+    n = x.shape[0]
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[n_out - 1] = n - 1
+    
+    every = (n - 2) / (n_out - 2)
+    a = 0
+    
+    for i in range(n_out - 2):
+        # Average of the next bucket is the third triangle vertex
+        avg_start = int(np.floor((i + 1) * every)) + 1
+        avg_end = min(int(np.floor((i + 2) * every)) + 1, n)
+        avg_x = 0.0
+        avg_y = 0.0
+        for j in range(avg_start, avg_end):
+            avg_x += x[j]
+            avg_y += y[j]
+        count = avg_end - avg_start
+        avg_x /= count
+        avg_y /= count
+        
+        # Keep the point in the current bucket that forms the largest triangle
+        range_start = int(np.floor(i * every)) + 1
+        range_end = int(np.floor((i + 1) * every)) + 1
+        max_area = -1.0
+        max_index = range_start
+        for j in range(range_start, range_end):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > max_area:
+                max_area = area
+                max_index = j
+        
+        selected[i + 1] = max_index
+        a = max_index
+    
+    return selected
+
+def downsample_indices(x, y, n_out):
+    """
+    Pick at most n_out representative points of a series with LTTB.
+    
+    Largest-Triangle-Three-Buckets keeps local peaks and troughs, so the
+    downsampled line looks like the original when plotted.
+    
+    Args:
+        x (np.ndarray): Sorted x values (e.g., timestamps as int64)
+        y (np.ndarray): Series values
+        n_out (int): Maximum number of points to keep
+    
+    Returns:
+        np.ndarray: Sorted integer indices into x/y
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    return _lttb_kernel(
+        np.ascontiguousarray(x, dtype=np.float64),
+        np.ascontiguousarray(y, dtype=np.float64),
+        n_out
+    )
 
 def calculate_rsi(prices, period=14):
     """
@@ -14,24 +112,117 @@ def calculate_rsi(prices, period=14):
     Returns:
         pd.Series: RSI values
     """
-    # Calculate price changes
-    delta = prices.diff()
+    values = prices.to_numpy()
+    dtype = np.float32 if values.dtype == np.float32 else np.float64
+    close = np.ascontiguousarray(values, dtype=dtype)
+    if NUMBA_AVAILABLE or len(close) == 0:
+        return pd.Series(_rsi_kernel(close, period), index=prices.index, name=prices.name)
+    
+    # Without numba the kernel is a Python loop; let pandas' ewm smooth the moves instead
+    delta = np.diff(close.astype(np.float64), prepend=close[0])
+    avg_gain = pd.Series(np.maximum(delta, 0.0)).ewm(span=period, adjust=False).mean().to_numpy()
+    avg_loss = pd.Series(np.maximum(-delta, 0.0)).ewm(span=period, adjust=False).mean().to_numpy()
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    rsi[avg_loss == 0] = np.where(avg_gain[avg_loss == 0] > 0, 100.0, np.nan)
+    rsi[0] = np.nan
+    
+    return pd.Series(rsi.astype(dtype, copy=False), index=prices.index, name=prices.name)
+
+if NUMBA_AVAILABLE:
+    # Compile the kernel at import so the first chart isn't hit by JIT latency
+    _rsi_kernel(np.linspace(1.0, 2.0, 20), 14)
+    _rsi_kernel(np.linspace(1.0, 2.0, 20, dtype=np.float32), 14)
+
+def trailing_run_length(mask):
+    """
+    Count how many consecutive True values end a boolean array.
     
-    # Separate gains and losses
-    gains = delta.where(delta > 0, 0)
-    losses = -delta.where(delta < 0, 0)
+    Args:
+        mask (np.ndarray): Boolean array (e.g., red-day flags)
     
-    # Calculate average gains and losses using exponential moving average
-    avg_gains = gains.ewm(span=period, adjust=False).mean()
-    avg_losses = losses.ewm(span=period, adjust=False).mean()
+    Returns:
+        int: Length of the trailing run of True values
+    """
+    mask = np.asarray(mask, dtype=bool)
     
-    # Calculate relative strength
-    rs = avg_gains / avg_losses
+    if mask.all():
+        return len(mask)
     
-    # Calculate RSI
-    rsi = 100 - (100 / (1 + rs))
+    # Position of the last False, counted from the end
+    return int(np.argmax(~mask[::-1]))
+
+def consecutive_red_days(closes, red=None):
+    """
+    Count consecutive red (down) days ending at each bar.
     
-    return rsi
+    Args:
+        closes (np.ndarray): Closing prices
+        red (np.ndarray): Optional red-day mask from compute_features(closes), to reuse
+    
+    Returns:
+        np.ndarray: int32 run length of down closes at each index (0 on the first day
+            and on any day that did not close lower)
+    """
+    if red is None:
+        closes = np.asarray(closes, dtype=np.float64)
+        red = closes[1:] < closes[:-1]
+    is_red = np.zeros(len(closes), dtype=bool)
+    is_red[1:] = red
+    
+    # Subtract the index of the most recent non-red day from each position
+    counter = np.arange(len(closes), dtype=np.int32)
+    last_reset = np.maximum.accumulate(np.where(is_red, 0, counter))
+    return counter - last_reset
+
+def compute_features(close):
+    """
+    Compute the per-bar price features shared by backtests and live signals.
+    
+    RSI is left to the caller, which picks its own smoothing.
+    
+    Args:
+        close (np.ndarray): Array of closing prices
+    
+    Returns:
+        dict: 'diffs' (day-over-day changes) and 'red' (True where the close fell)
+    """
+    close = np.ascontiguousarray(close)
+    if close.dtype != np.float32:
+        close = close.astype(np.float64, copy=False)
+    
+    diffs = np.diff(close)
+    
+    return {
+        'diffs': diffs,
+        'red': diffs < 0
+    }
+
+# Plain symbols, share classes (BRK-B), exchange suffixes (SHOP.TO), indices (^GSPC), FX/futures (EURUSD=X)
+TICKER_PATTERN = r'\^?[A-Z0-9][A-Z0-9.\-=]{0,14}'
+
+def split_valid_tickers(tickers):
+    """
+    Separate well-formed ticker symbols from malformed ones in a single batch.
+    
+    This is a format check only; symbols that do not exist are caught when
+    their download comes back empty.
+    
+    Args:
+        tickers (list): Ticker symbols (already upper-cased)
+    
+    Returns:
+        tuple: (valid_tickers, invalid_tickers)
+    """
+    symbols = pd.Series(tickers, dtype=object)
+    valid = symbols.str.fullmatch(TICKER_PATTERN).fillna(False).to_numpy(dtype=bool)
+    
+    return symbols[valid].tolist(), symbols[~valid].tolist()
+
+# Symbols already confirmed to have data. Only positives are remembered: a failed or
+# rate-limited download looks the same as an unknown symbol, so negatives are re-checked
+_VALID_TICKERS = set()
 
 def validate_ticker(ticker):
     """
@@ -43,22 +234,33 @@ def validate_ticker(ticker):
     Returns:
         bool: True if ticker is valid, False otherwise
     """
-    try:
-        # Try to download a small amount of recent data
-        data = yf.download(ticker, period="5d", progress=False)
-        
-        # Check if data exists and has content
-        if data is None:
-            return False
-        
-        # Handle both single and multi-level column DataFrames
-        if hasattr(data, 'shape'):
-            return data.shape[0] > 0
-        else:
-            return len(data) > 0
+    return validate_tickers([ticker]).get(ticker, False)
+
+def validate_tickers(tickers):
+    """
+    Validate several ticker symbols with one batched download.
     
-    except Exception:
-        return False
+    Args:
+        tickers (list): Stock ticker symbols
+    
+    Returns:
+        dict: True for each ticker that returned recent data, False otherwise
+    """
+    tickers = list(dict.fromkeys(tickers))
+    unknown = [ticker for ticker in tickers if ticker not in _VALID_TICKERS]
+    
+    if unknown:
+        import yfinance as yf
+        from price_cache import split_ticker_frames
+        
+        try:
+            # Try to download a small amount of recent data for all unconfirmed symbols at once
+            data = yf.download(unknown, period="5d", group_by='ticker', threads=True, progress=False)
+            _VALID_TICKERS.update(split_ticker_frames(data, unknown))
+        except Exception:
+            pass  # leave them unconfirmed so the next call retries
+    
+    return {ticker: ticker in _VALID_TICKERS for ticker in tickers}
 
 def format_percentage(value, decimals=2):
     """
@@ -73,6 +275,32 @@ def format_percentage(value, decimals=2):
     """
     return f"{value * 100:.{decimals}f}%"
 
+@njit(cache=True)
+def _max_drawdown_kernel(returns):
+    """
+    Single pass over percentage returns tracking cumulative growth and its running peak.
+    
+    Args:
+        returns (np.ndarray): float64 returns in percent
+    
+    Returns:
+        float: Maximum drawdown as a percentage
+    """
+    cum_return = 1.0
+    running_max = -np.inf
+    max_drawdown = 0.0
+    
+    for r in returns:
+        cum_return *= 1.0 + r / 100.0
+        if cum_return > running_max:
+            running_max = cum_return
+        
+        drawdown = (cum_return - running_max) / running_max
+        if drawdown < max_drawdown:
+            max_drawdown = drawdown
+    
+    return abs(max_drawdown) * 100.0
+
 def calculate_max_drawdown(returns):
     """
     Calculate the maximum drawdown from a series of returns.
@@ -83,20 +311,51 @@ def calculate_max_drawdown(returns):
     Returns:
         float: Maximum drawdown as a percentage
     """
-    if not returns:
+    if len(returns) == 0:
         return 0
     
-    # Convert to cumulative returns
-    cum_returns = np.cumprod(1 + np.array(returns) / 100)
+    returns = np.ascontiguousarray(returns, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        return _max_drawdown_kernel(returns)
     
-    # Calculate running maximum
+    # Without numba the kernel is a Python loop; vectorize in place instead
+    cum_returns = np.divide(returns, 100.0)
+    cum_returns += 1.0
+    np.cumprod(cum_returns, out=cum_returns)
     running_max = np.maximum.accumulate(cum_returns)
+    drawdown = np.divide(cum_returns, running_max, out=cum_returns)
+    drawdown -= 1.0
+    return abs(min(float(drawdown.min()), 0.0)) * 100.0
+
+@njit(cache=True)
+def _sharpe_kernel(returns, daily_risk_free):
+    """
+    Annualized Sharpe ratio from one Welford pass over excess returns.
     
-    # Calculate drawdown
-    drawdown = (cum_returns - running_max) / running_max
+    Args:
+        returns (np.ndarray): float64 returns in percent
+        daily_risk_free (float): Risk-free rate per period, as a decimal
     
-    # Return maximum drawdown as percentage
-    return abs(np.min(drawdown)) * 100
+    Returns:
+        float: Sharpe ratio, or 0 when the excess returns have no spread
+    """
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    
+    for r in returns:
+        excess = r / 100.0 - daily_risk_free
+        count += 1
+        delta = excess - mean
+        mean += delta / count
+        m2 += delta * (excess - mean)
+    
+    # Population variance, matching np.std's default
+    std = np.sqrt(m2 / count)
+    if std == 0:
+        return 0.0
+    
+    return mean / std * np.sqrt(252)
 
 def calculate_sharpe_ratio(returns, risk_free_rate=0.02):
     """
@@ -109,22 +368,22 @@ def calculate_sharpe_ratio(returns, risk_free_rate=0.02):
     Returns:
         float: Sharpe ratio
     """
-    if not returns or len(returns) < 2:
+    if len(returns) < 2:
         return 0
     
-    # Convert percentage returns to decimal
-    decimal_returns = np.array(returns) / 100
-    
-    # Calculate excess returns (assuming returns are already annualized)
-    excess_returns = decimal_returns - risk_free_rate / 252  # Daily risk-free rate
+    # Excess returns over the daily risk-free rate (assuming returns are already annualized)
+    returns = np.ascontiguousarray(returns, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        return _sharpe_kernel(returns, risk_free_rate / 252)
     
-    # Calculate Sharpe ratio
-    if np.std(excess_returns) == 0:
-        return 0
-    
-    sharpe = np.mean(excess_returns) / np.std(excess_returns) * np.sqrt(252)
+    # Without numba the kernel is a Python loop; vectorize in place instead
+    # Identical returns have no spread; test that exactly, as rounding leaves np.std slightly above 0
+    if np.ptp(returns) == 0:
+        return 0.0
     
-    return sharpe
+    excess_returns = np.divide(returns, 100.0)
+    excess_returns -= risk_free_rate / 252
+    return float(excess_returns.mean() / excess_returns.std() * np.sqrt(252))
 
 def get_stock_info(ticker):
     """
@@ -136,6 +395,8 @@ def get_stock_info(ticker):
     Returns:
         dict: Stock information or empty dict if error
     """
+    import yfinance as yf
+    
     try:
         stock = yf.Ticker(ticker)
         info = stock.info
@@ -191,42 +452,127 @@ def format_currency(value, currency='USD'):
     else:
         return f"{value:,.2f} {currency}"
 
+@njit(cache=True)
+def _trade_metrics_kernel(returns, daily_risk_free):
+    """
+    Fused single pass over trade returns for calculate_trade_statistics.
+    
+    Tracks Welford mean/variance, the compounded drawdown and the win/loss
+    split together so the returns buffer is traversed once.
+    
+    Args:
+        returns (np.ndarray): float64 returns in percent
+        daily_risk_free (float): Risk-free rate per period, as a decimal
+    
+    Returns:
+        tuple: (mean, std, sharpe, max_drawdown, winning_trades, losing_trades,
+            gross_win, gross_loss, largest_win, largest_loss)
+    """
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    
+    cum_return = 1.0
+    running_max = -np.inf
+    max_drawdown = 0.0
+    
+    winning_trades = 0
+    losing_trades = 0
+    gross_win = 0.0
+    gross_loss = 0.0
+    largest_win = 0.0
+    largest_loss = 0.0
+    
+    for r in returns:
+        count += 1
+        delta = r - mean
+        mean += delta / count
+        m2 += delta * (r - mean)
+        
+        cum_return *= 1.0 + r / 100.0
+        if cum_return > running_max:
+            running_max = cum_return
+        drawdown = (cum_return - running_max) / running_max
+        if drawdown < max_drawdown:
+            max_drawdown = drawdown
+        
+        if r > 0:
+            winning_trades += 1
+            gross_win += r
+            if r > largest_win:
+                largest_win = r
+        elif r < 0:
+            losing_trades += 1
+            gross_loss += r
+            if r < largest_loss:
+                largest_loss = r
+    
+    # Population std, matching np.std's default; the excess-return spread is std / 100
+    std = np.sqrt(m2 / count)
+    sharpe = 0.0
+    if count >= 2 and std > 0:
+        sharpe = (mean / 100.0 - daily_risk_free) / (std / 100.0) * np.sqrt(252)
+    
+    return (mean, std, sharpe, abs(max_drawdown) * 100.0, winning_trades, losing_trades,
+            gross_win, gross_loss, largest_win, largest_loss)
+
 def calculate_trade_statistics(trades):
     """
     Calculate detailed statistics from a list of trades.
     
     Args:
-        trades (list): List of trade dictionaries
+        trades (list or pd.DataFrame): List of trade dictionaries, or a DataFrame
+            with 'return_pct' and 'days_held' columns
     
     Returns:
         dict: Detailed trade statistics
     """
-    if not trades:
+    if len(trades) == 0:
         return {}
     
-    returns = [trade['return_pct'] for trade in trades]
-    days_held = [trade['days_held'] for trade in trades if trade['days_held'] is not None]
+    if isinstance(trades, pd.DataFrame):
+        # Column reads instead of a dict lookup per trade
+        returns = trades['return_pct'].to_numpy(dtype=np.float64)
+        days_held = trades['days_held'].dropna().to_numpy(dtype=np.float64)
+    else:
+        returns = np.fromiter((trade['return_pct'] for trade in trades), dtype=np.float64, count=len(trades))
+        days_held = [trade['days_held'] for trade in trades if trade['days_held'] is not None]
     
-    winning_trades = [r for r in returns if r > 0]
-    losing_trades = [r for r in returns if r < 0]
+    if NUMBA_AVAILABLE:
+        (avg_return, return_std, sharpe_ratio, max_drawdown, winning_trades, losing_trades,
+         gross_win, gross_loss, largest_win, largest_loss) = _trade_metrics_kernel(returns, 0.02 / 252)
+    else:
+        # Without numba the fused kernel is a Python loop; use whole-array reductions instead
+        wins = returns > 0
+        losses = returns < 0
+        winning_trades = int(np.count_nonzero(wins))
+        losing_trades = int(np.count_nonzero(losses))
+        gross_win = float(returns.sum(where=wins))
+        gross_loss = float(returns.sum(where=losses))
+        largest_win = float(returns.max(where=wins, initial=0.0))
+        largest_loss = float(returns.min(where=losses, initial=0.0))
+        avg_return = float(returns.mean())
+        return_std = float(returns.std())  # population std, as the kernel computes
+        sharpe_ratio = calculate_sharpe_ratio(returns)
+        max_drawdown = calculate_max_drawdown(returns)
     
     stats = {
         'total_trades': len(trades),
-        'winning_trades': len(winning_trades),
-        'losing_trades': len(losing_trades),
-        'win_rate': len(winning_trades) / len(trades) * 100 if trades else 0,
-        'avg_win': np.mean(winning_trades) if winning_trades else 0,
-        'avg_loss': np.mean(losing_trades) if losing_trades else 0,
-        'largest_win': max(winning_trades) if winning_trades else 0,
-        'largest_loss': min(losing_trades) if losing_trades else 0,
-        'avg_days_held': np.mean(days_held) if days_held else 0,
-        'profit_factor': abs(sum(winning_trades) / sum(losing_trades)) if losing_trades and sum(losing_trades) != 0 else float('inf') if winning_trades else 0,
-        'total_return': sum(returns),
-        'avg_return': np.mean(returns),
+        'winning_trades': winning_trades,
+        'losing_trades': losing_trades,
+        'win_rate': winning_trades / len(trades) * 100,
+        'avg_win': gross_win / winning_trades if winning_trades else 0,
+        'avg_loss': gross_loss / losing_trades if losing_trades else 0,
+        'largest_win': largest_win,
+        'largest_loss': largest_loss,
+        'avg_days_held': np.mean(days_held) if len(days_held) else 0,
+        'profit_factor': abs(gross_win / gross_loss) if losing_trades and gross_loss != 0 else float('inf') if winning_trades else 0,
+        'total_return': gross_win + gross_loss,
+        'avg_return': avg_return,
         'median_return': np.median(returns),
-        'return_std': np.std(returns),
-        'max_drawdown': calculate_max_drawdown(returns),
-        'sharpe_ratio': calculate_sharpe_ratio(returns)
+        'return_std': return_std,
+        'max_drawdown': max_drawdown,
+        'sharpe_ratio': sharpe_ratio
     }
     
     return stats